@@ -1,53 +1,55 @@
 # Flask Backend for Resonance.ai WebUI Integration
-# This file integrates with your existing resonance_scanner_v12_5.py
+# The scan engine from the resonance package runs as a background task in this
+# process and publishes results on its in-memory event bus. Events reach the
+# dashboards through a Broadcaster with a bounded, ack-paced queue per client,
+# so a slow tab never makes server memory grow.
 
 from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
-import threading
-import time
-import json
-import os
-from datetime import datetime, timezone
-import queue
-import requests
-
-# Import your existing scanner functions
-# from resonance_scanner_v12_5 import *
+from flask_socketio import SocketIO
+
+from resonance import settings
+from resonance.broadcast import Broadcaster, RELIABLE
+from resonance.coordinator import Coordinator
+from resonance.events import BREAKOUT_ALERT, SCAN_RESULT, SWEEP_DONE, bus
+from resonance.http_session import get_session
+from resonance.metrics import StatsAggregator
+from resonance.scan_batcher import ScanBatcher, merge_frames, WEBUI_BATCH, WEBUI_BATCH_SEC, WEBUI_MAX_FPS
+from resonance.scanner import ScannerEngine, all_pairs
+from resonance.sharding import ShardedScanner
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Global variables for scanner state
-scanner_running = True
-scanner_settings = {
-    'scan_interval': 2,
-    'volume_floor': 2000,
-    'alert_mode': 'simple',
-    'fast_threshold': 0.013,
-    'medium_threshold': 0.018,
-    'slow_threshold': 0.024,
-    'fast_ratio': 1.3,
-    'medium_ratio': 1.7,
-    'slow_ratio': 2.2,
-    'discord_webhook': '',
-    'telegram_token': '',
-    'telegram_chat_id': ''
-}
-
-# Statistics tracking
-stats = {
-    'total_scanned': 0,
-    'total_alerts': 0,
-    'breakouts_today': 0,
-    'start_time': datetime.now(timezone.utc),
-    'scan_rate': 0,
-    'avg_volume': 0,
-    'top_gainer': '--'
-}
-
-# Queue for real-time updates
-update_queue = queue.Queue()
+# Real threads: the engine, the broadcaster pumps and the publishers block on
+# threading primitives, which would stall an eventlet/gevent hub
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+
+# The real detection engine, started on its own thread in __main__ (or, with
+# SCAN_SHARDS > 1, shard processes whose results are published from here)
+if settings.SCAN_SHARDS > 1:
+    engine = ShardedScanner()
+else:
+    engine = ScannerEngine()
+
+# Outbound events, queued per client: breakout alerts are never dropped, scan/stats
+# updates keep only the newest snapshot (unsent scan frames are merged forward)
+def send_to_client(event, payload, sid, callback):
+    socketio.emit(event, payload, to=sid, callback=callback)
+
+broadcaster = Broadcaster(
+    send=send_to_client,
+    spawn=socketio.start_background_task,
+    disconnect=lambda sid: socketio.server.disconnect(sid),
+    policies={'breakout_alert': RELIABLE},
+    mergers={'scan_update': merge_frames} if WEBUI_BATCH else {},
+    min_interval={'scan_update': 1.0 / WEBUI_MAX_FPS if WEBUI_MAX_FPS > 0 else 0.0},
+)
+
+# Settings shared with the engine (resonance.settings.ScannerSettings)
+scanner_settings = settings.scanner_settings
+
+# Statistics aggregated from the engine's events; snapshots are rebuilt by stats_updater
+stats = StatsAggregator()
+
 
 @app.route('/')
 def index():
@@ -57,36 +59,36 @@ def index():
 @app.route('/api/settings', methods=['GET', 'POST'])
 def handle_settings():
     """Handle settings GET/POST requests"""
-    global scanner_settings
-    
     if request.method == 'POST':
         data = request.get_json()
-        scanner_settings.update(data)
         
-        # Apply settings to the scanner
-        apply_scanner_settings(scanner_settings)
+        # Apply settings to the running engine
+        try:
+            engine.update_settings(data)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
         
         return jsonify({'status': 'success', 'message': 'Settings updated'})
     
-    return jsonify(scanner_settings)
+    return jsonify(vars(scanner_settings))
 
 @app.route('/api/stats')
 def get_stats():
     """Get current statistics"""
-    current_stats = stats.copy()
-    current_stats['uptime'] = str(datetime.now(timezone.utc) - stats['start_time']).split('.')[0]
-    return jsonify(current_stats)
+    return jsonify(stats.snapshot())
 
 @app.route('/api/scanner/toggle', methods=['POST'])
 def toggle_scanner():
     """Toggle scanner on/off"""
-    global scanner_running
-    scanner_running = not scanner_running
+    if engine.running:
+        engine.pause()
+    else:
+        engine.resume()
     
-    status = 'running' if scanner_running else 'stopped'
-    socketio.emit('scanner_status', {'status': status, 'running': scanner_running})
+    status = 'running' if engine.running else 'stopped'
+    broadcaster.publish('scanner_status', {'status': status, 'running': engine.running})
     
-    return jsonify({'status': status, 'running': scanner_running})
+    return jsonify({'status': status, 'running': engine.running})
 
 @app.route('/api/test-alert', methods=['POST'])
 def test_alert():
@@ -97,9 +99,9 @@ def test_alert():
     test_message = "🧪 **TEST ALERT** 🧪\n**System**: Resonance.ai WebUI\n**Status**: Alert system working correctly"
     
     try:
-        if alert_type == 'discord' and scanner_settings['discord_webhook']:
-            response = requests.post(
-                scanner_settings['discord_webhook'],
+        if alert_type == 'discord' and scanner_settings.discord_webhook:
+            response = get_session().post(
+                scanner_settings.discord_webhook,
                 json={'content': test_message},
                 timeout=10
             )
@@ -108,12 +110,12 @@ def test_alert():
             else:
                 return jsonify({'status': 'error', 'message': f'Discord error: {response.status_code}'})
                 
-        elif alert_type == 'telegram' and scanner_settings['telegram_token'] and scanner_settings['telegram_chat_id']:
-            url = f"https://api.telegram.org/bot{scanner_settings['telegram_token']}/sendMessage"
-            response = requests.post(
+        elif alert_type == 'telegram' and scanner_settings.telegram_token and scanner_settings.telegram_chat_id:
+            url = f"https://api.telegram.org/bot{scanner_settings.telegram_token}/sendMessage"
+            response = get_session().post(
                 url,
                 json={
-                    'chat_id': scanner_settings['telegram_chat_id'],
+                    'chat_id': scanner_settings.telegram_chat_id,
                     'text': test_message,
                     'parse_mode': 'Markdown'
                 },
@@ -133,108 +135,72 @@ def test_alert():
 def handle_connect():
     """Handle WebSocket connection"""
     print('Client connected')
+    broadcaster.add_client(request.sid)
     # Send current stats to newly connected client
-    emit('stats_update', get_stats().data)
-    emit('scanner_status', {'status': 'running' if scanner_running else 'stopped', 'running': scanner_running})
+    broadcaster.publish('stats_update', stats.snapshot(), sid=request.sid)
+    broadcaster.publish('scanner_status', {'status': 'running' if engine.running else 'stopped', 'running': engine.running}, sid=request.sid)
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle WebSocket disconnection"""
     print('Client disconnected')
+    broadcaster.remove_client(request.sid)
+
+@app.route('/api/clients')
+def get_client_metrics():
+    """Per-client outbound queue depth and delivery counters"""
+    return jsonify(broadcaster.metrics())
+
+# Engine events -> WebUI
+# Scan results are collected into one columnar scan_update frame per sweep/time slice
+batcher = ScanBatcher()
+
+def on_scan_result(data):
+    stats.on_scan_result(data)
+    if WEBUI_BATCH:
+        batcher.add(data['symbol'], data['change'], data['band_width'])
+    else:
+        broadcaster.publish('scan_update', data)
+
+def emit_scan_batch(_=None):
+    frame = batcher.flush()
+    if frame:
+        broadcaster.publish('scan_update', frame)
+
+def scan_batch_flusher():
+    """Flush on a fixed time slice too, so frames held back by the rate limit (or stream mode) still go out."""
+    while True:
+        socketio.sleep(WEBUI_BATCH_SEC)
+        emit_scan_batch()
 
-def apply_scanner_settings(settings):
-    """Apply settings to the scanner"""
-    # This function would update your scanner's configuration
-    # You would modify your original scanner code to read from these settings
-    print(f"Applied settings: {settings}")
+def on_breakout_alert(data):
+    stats.on_breakout_alert(data)
+    broadcaster.publish('breakout_alert', data)
 
-def scanner_worker():
-    """Modified version of your scanner main loop"""
-    global stats, scanner_running
-    
-    # Import your existing functions here
-    # from resonance_scanner_v12_5 import get_candles, is_breakout_band, etc.
-    
-    # This is a simplified version - integrate with your actual scanner code
-    coins = ['BTC-USD', 'ETH-USD', 'ADA-USD', 'SOL-USD', 'AVAX-USD', 'LINK-USD']  # Subset for demo
-    
-    while True:
-        if not scanner_running:
-            time.sleep(1)
-            continue
-            
-        try:
-            for pair in coins:
-                if not scanner_running:
-                    break
-                    
-                # Your existing scanning logic would go here
-                # candles = get_candles(pair)
-                # ... rest of your breakout detection logic
-                
-                # For demo purposes, simulate scanning
-                stats['total_scanned'] += 1
-                
-                # Emit scan result to WebUI
-                scan_data = {
-                    'type': 'scan_result',
-                    'symbol': pair,
-                    'change': (hash(pair) % 1000 - 500) / 100,  # Demo data
-                    'band_width': (hash(pair) % 500) / 100,
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }
-                socketio.emit('scan_update', scan_data)
-                
-                # Simulate occasional breakout alerts
-                if hash(pair + str(int(time.time()))) % 100 < 5:  # 5% chance
-                    alert_data = {
-                        'type': 'breakout_alert',
-                        'symbol': pair,
-                        'change': abs(scan_data['change']),
-                        'band_width': scan_data['band_width'],
-                        'bands': ['FAST', 'MEDIUM'],
-                        'price': 50000.12345,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
-                    }
-                    socketio.emit('breakout_alert', alert_data)
-                    stats['total_alerts'] += 1
-                    stats['breakouts_today'] += 1
-                
-                time.sleep(0.1)  # Small delay between coins
-                
-        except Exception as e:
-            print(f"Scanner error: {e}")
-            
-        # Wait between scan cycles
-        time.sleep(scanner_settings['scan_interval'])
+bus.subscribe(SCAN_RESULT, on_scan_result)
+bus.subscribe(SWEEP_DONE, emit_scan_batch)
+bus.subscribe(BREAKOUT_ALERT, on_breakout_alert)
 
 def stats_updater():
-    """Update statistics periodically"""
-    global stats
-    
+    """Rebuild the stats snapshot and push it to the dashboards every few seconds"""
     while True:
-        # Update stats
-        stats['scan_rate'] = stats['total_scanned'] / max(1, (datetime.now(timezone.utc) - stats['start_time']).seconds)
-        stats['avg_volume'] = 25000 + (hash(str(time.time())) % 50000)  # Demo data
-        
-        gainers = ['BTC-USD +3.2%', 'ETH-USD +2.8%', 'SOL-USD +4.1%', 'AVAX-USD +2.3%']
-        stats['top_gainer'] = gainers[int(time.time()) % len(gainers)]
-        
-        # Emit to all connected clients
-        socketio.emit('stats_update', stats)
-        
-        time.sleep(5)  # Update every 5 seconds
+        broadcaster.publish('stats_update', stats.refresh())
+        socketio.sleep(5)  # Update every 5 seconds
 
 if __name__ == '__main__':
-    # Start background threads
-    scanner_thread = threading.Thread(target=scanner_worker, daemon=True)
-    stats_thread = threading.Thread(target=stats_updater, daemon=True)
-    
-    scanner_thread.start()
-    stats_thread.start()
+    # Start the scan engine (own thread) and the stats publisher
+    if settings.COORD_DB and isinstance(engine, ScannerEngine):
+        # Scan only this instance's share of the pairs (see resonance/coordinator.py)
+        Coordinator(settings.COORD_DB).attach(engine, all_pairs)
+    engine.start()
+    socketio.start_background_task(stats_updater)
+    if WEBUI_BATCH:
+        socketio.start_background_task(scan_batch_flusher)
     
     print("🚀 Starting Resonance.ai WebUI Server...")
     print("📊 Dashboard available at: http://localhost:5000")
     
-    # Run the Flask-SocketIO server
-    socketio.run(app, host='0.0.0.0', port=5000, debug=True)
+    # Run the Flask-SocketIO server on Werkzeug, threading mode; without a TTY
+    # (Docker, systemd, nohup) it refuses to start unless explicitly allowed.
+    # The reloader would start a second process (and a second engine)
+    socketio.run(app, host='0.0.0.0', port=5000, use_reloader=False, allow_unsafe_werkzeug=True)
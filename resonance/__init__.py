@@ -0,0 +1,9 @@
+"""
+Resonance.ai breakout scanner.
+
+Importing the package (or any of its modules) has no side effects: no network
+calls, threads or scan loop. Run the scanner with `python -m resonance`, or
+drive the engine directly, e.g. `from resonance.scanner import scan_sweep`.
+"""
+
+__version__ = "12.5"
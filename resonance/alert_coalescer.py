@@ -0,0 +1,82 @@
+# Alert de-duplication, cooldown and batching.
+# A closed candle keeps satisfying the same band on every cycle until the next one
+# opens, and market-wide moves trigger many pairs at once. The coalescer drops
+# repeats of (pair, band, candle time), enforces a per-(pair, band) cooldown, and
+# holds fresh alerts briefly so simultaneous breakouts go out as one digest.
+import os
+import threading
+import time
+
+ALERT_COOLDOWN_SEC = float(os.getenv("ALERT_COOLDOWN_SEC", "120"))   # min gap between alerts for one pair+band
+ALERT_DIGEST_SEC = float(os.getenv("ALERT_DIGEST_SEC", "2"))         # stream mode: how long to gather a digest
+
+
+class AlertCoalescer:
+    def __init__(self, cooldown_sec=ALERT_COOLDOWN_SEC):
+        self.cooldown_sec = cooldown_sec
+        self._last = {}      # (pair, band) -> (candle_time, alerted_at)
+        self._pending = []
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self._flusher = None
+        # Optional claim(pair, band, candle_time) -> bool, shared by all scanner
+        # instances (see coordinator.py); a hit is only kept if this instance wins it
+        self.claim = None
+
+    def filter(self, pair, band_details, candle_time, now=None):
+        """
+        Keep only the band hits that should alert now: not already alerted for this
+        candle, and outside the pair+band cooldown. Records the ones kept.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            candidates = [bd for bd in band_details if self._due(pair, bd["name"], candle_time, now)]
+            self.suppressed += len(band_details) - len(candidates)
+        if self.claim is None:
+            claimed = [(bd, True) for bd in candidates]
+        else:
+            # The claim is a database round trip; keep it outside the lock so other
+            # scan threads aren't blocked on it, and re-check once it returns
+            claimed = [(bd, self.claim(pair, bd["name"], candle_time)) for bd in candidates]
+
+        fresh = []
+        with self._lock:
+            for bd, won in claimed:
+                if not self._due(pair, bd["name"], candle_time, now):
+                    self.suppressed += 1
+                    continue
+                self._last[(pair, bd["name"])] = (candle_time, now)
+                if not won:
+                    self.suppressed += 1
+                    continue
+                fresh.append(bd)
+        return fresh
+
+    def _due(self, pair, band, candle_time, now):
+        """True unless (pair, band) already alerted for this candle or is in its cooldown. Call under the lock."""
+        last = self._last.get((pair, band))
+        return last is None or (last[0] != candle_time and now - last[1] >= self.cooldown_sec)
+
+    def add(self, alert):
+        """Hold an alert (dict of build_alert_message kwargs) for the next digest."""
+        with self._lock:
+            self._pending.append(alert)
+
+    def drain(self):
+        """Take every pending alert, oldest first."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def start_flusher(self, interval, flush):
+        """Call flush() every `interval` seconds on a daemon thread (for stream mode)."""
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    flush()
+                except Exception as e:
+                    print(f"❌ Alert flush error: {e}", flush=True)
+
+        self._flusher = threading.Thread(target=loop, name="alert-flusher", daemon=True)
+        self._flusher.start()
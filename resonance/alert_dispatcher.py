@@ -0,0 +1,161 @@
+# Non-blocking alert delivery.
+# The scan loop hands finished alert messages to submit(), which only enqueues
+# them. Each destination (Discord, Telegram, ...) has its own bounded queue and
+# worker threads, so a slow or dead webhook only delays its own deliveries and
+# never the scan. Failed sends are retried with jittered exponential backoff.
+import os
+import queue
+import threading
+import time
+
+from .rate_limiter import backoff_delay
+
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "256"))      # per destination
+ALERT_WORKERS = int(os.getenv("ALERT_WORKERS", "2"))              # per destination
+ALERT_MAX_RETRIES = int(os.getenv("ALERT_MAX_RETRIES", "3"))
+# What to do when a destination's queue is full: drop_oldest keeps the freshest alerts,
+# drop_newest keeps what is already queued and rejects the incoming alert.
+ALERT_OVERFLOW = os.getenv("ALERT_OVERFLOW", "drop_oldest")
+
+_STOP = object()
+
+
+class _Destination:
+    def __init__(self, name, send, maxsize):
+        self.name = name
+        self.send = send
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.workers = []
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.latency_total = 0.0
+
+
+class AlertDispatcher:
+    """
+    Bounded in-process alert queue with background workers.
+    Destinations are callables send(message) -> bool; False or an exception
+    counts as a failed attempt and is retried up to `max_retries` times.
+    """
+
+    def __init__(
+        self,
+        maxsize=ALERT_QUEUE_SIZE,
+        workers_per_destination=ALERT_WORKERS,
+        max_retries=ALERT_MAX_RETRIES,
+        overflow=ALERT_OVERFLOW,
+    ):
+        if overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Unknown alert overflow policy: {overflow}")
+        self.maxsize = maxsize
+        self.workers_per_destination = workers_per_destination
+        self.max_retries = max_retries
+        self.overflow = overflow
+        self._destinations = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def add_destination(self, name, send):
+        """Register a destination and start its workers."""
+        dest = _Destination(name, send, self.maxsize)
+        for i in range(self.workers_per_destination):
+            t = threading.Thread(target=self._worker, args=(dest,), name=f"alert-{name}-{i}", daemon=True)
+            dest.workers.append(t)
+            t.start()
+        self._destinations[name] = dest
+
+    def submit(self, message, destinations=None):
+        """
+        Queue `message` for every destination (or only the named ones).
+        Never blocks; returns the number of destinations it was queued for.
+        """
+        queued = 0
+        for name, dest in self._destinations.items():
+            if destinations is not None and name not in destinations:
+                continue
+            if self._enqueue(dest, (time.monotonic(), message)):
+                queued += 1
+        return queued
+
+    def _enqueue(self, dest, item):
+        try:
+            dest.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            pass
+
+        with self._lock:
+            dest.dropped += 1
+        if self.overflow == "drop_newest":
+            print(f"⚠️ Alert queue full for {dest.name}, dropping new alert", flush=True)
+            return False
+
+        print(f"⚠️ Alert queue full for {dest.name}, dropping oldest queued alert", flush=True)
+        try:
+            dest.queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            dest.queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _worker(self, dest):
+        while True:
+            item = dest.queue.get()
+            if item is _STOP:
+                return
+            queued_at, message = item
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    ok = dest.send(message)
+                except Exception as e:
+                    print(f"❌ {dest.name} alert send raised: {e}", flush=True)
+                    ok = False
+                if ok:
+                    with self._lock:
+                        dest.sent += 1
+                        dest.latency_total += time.monotonic() - queued_at
+                    break
+                if attempt < self.max_retries and not self._stopping.is_set():
+                    with self._lock:
+                        dest.retried += 1
+                    time.sleep(backoff_delay(attempt))
+                else:
+                    with self._lock:
+                        dest.failed += 1
+                    print(f"❌ Giving up on {dest.name} alert after {attempt + 1} attempt(s)", flush=True)
+                    break
+
+    def stop(self, timeout=5.0):
+        """Let workers drain what is queued (no further retries), then stop them."""
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        for dest in self._destinations.values():
+            for _ in dest.workers:
+                try:
+                    dest.queue.put(_STOP, timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Full:
+                    pass
+        for dest in self._destinations.values():
+            for t in dest.workers:
+                t.join(max(0.0, deadline - time.monotonic()))
+
+    def metrics(self):
+        """Per-destination counters: queued, sent, failed, retried, dropped, avg_latency_ms."""
+        with self._lock:
+            return {
+                name: {
+                    "queued": dest.queue.qsize(),
+                    "sent": dest.sent,
+                    "failed": dest.failed,
+                    "retried": dest.retried,
+                    "dropped": dest.dropped,
+                    "avg_latency_ms": (dest.latency_total / dest.sent * 1000) if dest.sent else 0.0,
+                }
+                for name, dest in self._destinations.items()
+            }
@@ -0,0 +1,198 @@
+# Alert formatting and delivery: Discord/Telegram senders, simple/pro message
+# builders, digests, and the shared dispatcher + coalescer.
+import atexit
+import threading
+from datetime import datetime, timezone
+
+from . import settings
+from .alert_coalescer import AlertCoalescer
+from .alert_dispatcher import AlertDispatcher
+from .http_session import get_session
+
+
+def send_discord_alert(pair, price, vol_info):
+    data = {
+        "content": f"🚨 **BREAKOUT DETECTED** 🚨\n**Pair**: `{pair}`\n**Price**: `${price:.8f}`\n**Vol Spike**: {vol_info}\n**Time**: {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}"
+    }
+    get_session().post(settings.DISCORD_WEBHOOK, json=data, timeout=10)
+
+def send_telegram_alert(message: str):
+    """Send alert message to Telegram bot. Returns True when delivered (or not configured)."""
+    try:
+        if not settings.TELEGRAM_BOT_TOKEN or not settings.TELEGRAM_CHAT_ID:
+            return True  # Skip if not configured
+
+        url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
+        data = {
+            "chat_id": settings.TELEGRAM_CHAT_ID,
+            "text": message,
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True
+        }
+        response = get_session().post(url, json=data, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ Telegram API error: {response.status_code} - {response.text}", flush=True)
+            return False
+        return True
+    except Exception as e:
+        print(f"❌ Failed to send Telegram message: {e}", flush=True)
+        return False
+
+def send_discord_rich(message: str):
+    """Post a message to the Discord webhook. Returns True when delivered."""
+    try:
+        response = get_session().post(settings.DISCORD_WEBHOOK, json={"content": message}, timeout=10)
+        if response.status_code not in (200, 204):
+            print(f"❌ Discord webhook error: {response.status_code} - {response.text}", flush=True)
+            return False
+        return True
+    except Exception as e:
+        print(f"❌ Failed to send Discord message: {e}", flush=True)
+        return False
+
+
+def build_alert_message_simple(
+    pair, price, percent_change, band_width, band_details, candle_interval_sec
+):
+    bands_str = ", ".join([bd["name"] for bd in band_details]) if band_details else "—"
+    return "\n".join([
+        "🚨 **BREAKOUT DETECTED** 🚨",
+        f"**Pair**: `{pair}`",
+        f"**Δ**: `{percent_change:.2f}%` | **W**: `{band_width:.2f}%`",
+        f"**Bands**: {bands_str}",
+        f"**Time**: {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}",
+    ])
+
+
+def format_band_line(bd):
+    """One '• **FAST** (n=10): over max by ...' line for a band hit (BandStats or legacy info dict)."""
+    name = bd["name"]
+    if "stats" in bd and bd["stats"] is not None:
+        s = bd["stats"]
+        return (
+            f"• **{name}** (n={s.window}): "
+            f"over max by `{s.over_max_pct:.2f}%`, "
+            f"vol `{s.vol:.0f}` vs avg `{s.avg_vol:.0f}` "
+            f"(x`{s.vol_mult:.2f}`), "
+            f"`${s.dollars_per_min:,.0f}/min`"
+        )
+    info = bd["info"]
+    return (
+        f"• **{name}** (n={info['window']}): "
+        f"over max by `{info['pct_over']:.2f}%`, "
+        f"vol `{info['last_vol']:.0f}` vs avg `{info['avg_vol']:.0f}` "
+        f"(x`{info['vol_ratio']:.2f}`), "
+        f"`${info['usd_per_min']:,.0f}/min`"
+    )
+
+
+def build_alert_message_pro(
+    pair, price, percent_change, band_width, band_details, candle_interval_sec
+):
+
+    lines = []
+    lines.append("🚨 **BREAKOUT DETECTED** 🚨")
+    lines.append(f"**Pair**: `{pair}`")
+    lines.append(f"**Price**: `${price:.8f}`")
+    lines.append(f"**Δ**: `{percent_change:.2f}%`  |  **W**: `{band_width:.2f}%`")
+    lines.append(f"**Candle**: `{candle_interval_sec}s`")
+
+
+    for bd in band_details:
+        lines.append(format_band_line(bd))
+    lines.append(f"**Time**: {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}")
+    return "\n".join(lines)
+
+
+def build_alert_message(
+    pair, price, percent_change, band_width, band_details, candle_interval_sec
+):
+    if settings.SIMPLE_MODE:
+        return build_alert_message_simple(
+            pair, price, percent_change, band_width, band_details, candle_interval_sec
+        )
+    else:
+        return build_alert_message_pro(
+            pair, price, percent_change, band_width, band_details, candle_interval_sec
+        )
+
+
+# Discord rejects messages over 2000 characters; keep digests safely below that
+DIGEST_MAX_CHARS = 1900
+
+def build_alert_digest(alerts, candle_interval_sec):
+    """
+    Combine several simultaneous breakouts into as few messages as possible.
+    alerts: list of dicts with pair, price, percent_change, band_width, band_details.
+    Returns a list of message strings, each under DIGEST_MAX_CHARS.
+    """
+    simple = settings.SIMPLE_MODE
+    header = f"🚨 **BREAKOUT DIGEST** ({len({a['pair'] for a in alerts})} pairs) 🚨"
+    if not simple:
+        header += f"\n**Candle**: `{candle_interval_sec}s`"
+    footer = f"**Time**: {datetime.now(timezone.utc).strftime('%H:%M:%S UTC')}"
+
+    blocks = []
+    for a in alerts:
+        if simple:
+            bands_str = ", ".join(bd["name"] for bd in a["band_details"]) or "—"
+            blocks.append(
+                f"`{a['pair']}` **Δ**: `{a['percent_change']:.2f}%` | **W**: `{a['band_width']:.2f}%` | {bands_str}"
+            )
+        else:
+            lines = [
+                f"**`{a['pair']}`** `${a['price']:.8f}` | "
+                f"**Δ**: `{a['percent_change']:.2f}%`  |  **W**: `{a['band_width']:.2f}%`"
+            ]
+            lines.extend(format_band_line(bd) for bd in a["band_details"])
+            blocks.append("\n".join(lines))
+
+    messages, current = [], [header]
+    size = len(header) + len(footer) + 2
+    for block in blocks:
+        if len(current) > 1 and size + len(block) + 1 > DIGEST_MAX_CHARS:
+            messages.append("\n".join(current + [footer]))
+            current, size = [header], len(header) + len(footer) + 2
+        current.append(block)
+        size += len(block) + 1
+    messages.append("\n".join(current + [footer]))
+    return messages
+
+
+# === Alert dispatch === #
+# Alerts are queued and delivered by background workers, so a slow webhook never stalls the scan.
+# The dispatcher (and its threads) is created on first use, not at import.
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher():
+    """Return the process-wide alert dispatcher, starting its workers on first use."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                dispatcher = AlertDispatcher()
+                dispatcher.add_destination("discord", send_discord_rich)
+                dispatcher.add_destination("telegram", send_telegram_alert)
+                atexit.register(dispatcher.stop)
+                # atexit runs in reverse order: flush held alerts before the workers stop
+                atexit.register(flush_alerts)
+                _dispatcher = dispatcher
+    return _dispatcher
+
+# Drops repeat hits for the same candle, applies the per pair+band cooldown and
+# batches simultaneous breakouts into one digest per flush
+alert_coalescer = AlertCoalescer()
+
+def flush_alerts():
+    """Send everything the coalescer is holding: one alert as usual, several as a digest."""
+    pending = alert_coalescer.drain()
+    if not pending:
+        return
+    if len(pending) == 1:
+        messages = [build_alert_message(candle_interval_sec=settings.CANDLE_INTERVAL, **pending[0])]
+    else:
+        messages = build_alert_digest(pending, settings.CANDLE_INTERVAL)
+    dispatcher = get_dispatcher()
+    for msg in messages:
+        dispatcher.submit(msg)
@@ -0,0 +1,398 @@
+# Historical backtest of the breakout bands (settings.BANDS).
+# Replays archived 1m candles (see candle_archive.py) through the same rules as
+# is_breakout_band(), evaluated at every candle close for every pair at once,
+# then simulates a trade per alert: entry after ENTRY_DELAY_SECS, exit at the
+# first TP_PCT / SL_PCT touch within LOOKAHEAD_MINUTES (or at the last close),
+# fees on both sides. Trade parameters come from the environment / .env, with
+# the names declared in .env.copy.
+#
+#   python -m resonance.backtest                 # LOOKBACK_HOURS of archived candles
+#   python -m resonance.backtest --backfill      # first top up the archive over REST
+#
+# All pairs are concatenated into flat columns (one row per candle, pairs back to
+# back), so every band check and every exit search is a handful of NumPy passes
+# over ~2M rows rather than a Python loop per candle. The bands share one
+# BandIndex (prefix sums and a sparse max table), so each extra band is a few
+# lookups per row rather than a pass per candle of its window.
+import argparse
+import csv
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from . import settings
+from .alert_coalescer import ALERT_COOLDOWN_SEC
+from .candle_archive import CandleArchive, CANDLE_STORE_DIR
+
+
+def load_params():
+    """Backtest parameters from the environment (names and defaults as in .env.copy)."""
+    return {
+        "lookback_hours": int(os.getenv("LOOKBACK_HOURS", "95")),
+        "granularity": int(os.getenv("TIMEFRAME_SEC", str(settings.CANDLE_INTERVAL))),
+        "tp_pct": float(os.getenv("TP_PCT", "0.10")),
+        "sl_pct": float(os.getenv("SL_PCT", "0.04")),
+        "fee_pct": float(os.getenv("FEE_PCT_PER_SIDE", "0.0005")),
+        "lookahead_min": int(os.getenv("LOOKAHEAD_MINUTES", "240")),
+        "entry_delay": int(os.getenv("ENTRY_DELAY_SECS", "0")),
+        "alerts_csv": os.getenv("ALERTS_CSV", "alerts_trades.csv"),
+        "results_csv": os.getenv("RESULTS_CSV", "results.csv"),
+        "show_samples": int(os.getenv("SHOW_SAMPLE_TRADES", "3")),
+    }
+
+
+class History:
+    """
+    Candles for many pairs as flat float64 columns, pairs back to back and each
+    pair oldest first. `columns` is a (6, n) array, one row per candle field;
+    lengths[p] is the number of candles of pairs[p]. pair_idx[i] is the pair of
+    candle i; starts/ends bound each pair's candles.
+    """
+
+    def __init__(self, pairs, columns, lengths):
+        self.pairs = pairs
+        self.columns = columns
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.time, self.low, self.high, self.open, self.close, self.volume = columns
+        self.ends = np.cumsum(self.lengths)
+        self.starts = self.ends - self.lengths
+        self.pair_idx = np.repeat(np.arange(len(pairs)), self.lengths)
+
+    @classmethod
+    def from_arrays(cls, pairs, arrays):
+        """arrays: one (n, 6) [time, low, high, open, close, volume] array per pair."""
+        kept = [(p, a) for p, a in zip(pairs, arrays) if len(a)]
+        rows = np.concatenate([a for _, a in kept]) if kept else np.empty((0, 6))
+        return cls([p for p, _ in kept], np.ascontiguousarray(rows.T), [len(a) for _, a in kept])
+
+    @classmethod
+    def from_archive(cls, archive, pairs, granularity, start, end):
+        return cls.from_arrays(pairs, [archive.read(p, granularity, start=start, end=end) for p in pairs])
+
+    def __len__(self):
+        return len(self.time)
+
+
+class BandIndex:
+    """
+    Window queries over a History, built once and shared by every band: prefix
+    sums of the volume and a sparse table of the highs (level k holds the max of
+    the 2**k rows starting at each row, built up to the longest window asked
+    for), so the max high and the volume sum of any window are two lookups each.
+    """
+
+    def __init__(self, h, granularity):
+        self.granularity = granularity
+        self.rows = np.arange(len(h))
+        self.pair_start = h.starts[h.pair_idx]
+        self.vol_prefix = np.concatenate(([0.0], np.cumsum(h.volume)))
+        self.levels = [h.high]
+        # Time is only sorted within a pair, so offset each pair's times by a gap
+        # no candle span reaches to sort them globally
+        self._key = h.pair_idx * 1e10 + h.time
+        self._period_start = {}
+
+    def period_start(self, lookback):
+        """First row inside the `lookback` candle periods ending at each row."""
+        start = self._period_start.get(lookback)
+        if start is None:
+            start = self._period_start[lookback] = np.searchsorted(
+                self._key, self._key - (lookback - 1) * self.granularity, side="left")
+        return start
+
+    def range_max(self, first, last):
+        """Max high over rows first..last (inclusive, last >= first) for each pair of bounds."""
+        level = np.frexp(last - first + 1)[1] - 1      # floor(log2(length))
+        top = int(level.max()) if len(level) else 0
+        while len(self.levels) <= top:
+            prev, step = self.levels[-1], 1 << (len(self.levels) - 1)
+            nxt = prev.copy()
+            np.maximum(prev[:-step], prev[step:], out=nxt[:-step])
+            self.levels.append(nxt)
+        out = np.empty(len(first))
+        for k in range(top + 1):
+            sel = level == k
+            out[sel] = np.maximum(self.levels[k][first[sel]], self.levels[k][last[sel] - (1 << k) + 1])
+        return out
+
+    def range_sum(self, first, last):
+        """Volume over rows first..last (inclusive; 0 when last < first)."""
+        return self.vol_prefix[last + 1] - self.vol_prefix[first]
+
+
+def evaluate_band(h, window, lookback, granularity, breakout_threshold, volume_spike_ratio, abs_dollar_volume_min,
+                  index=None):
+    """
+    is_breakout_band() at every candle close. Like the live scanner, the window
+    behind each candle is the last `window` candles among those that fall in the
+    `lookback` candle periods ending with it, and the band is only evaluated when
+    all `window` of them are there. Pass one BandIndex to share it across bands.
+    Returns (hit, pct_over, vol_ratio) per row.
+    """
+    index = BandIndex(h, granularity) if index is None else index
+    idx = index.rows
+    first = np.maximum(np.maximum(index.pair_start, idx - window + 1), index.period_start(lookback))
+    eff = idx - first + 1
+
+    has_prior = eff > 1
+    max_high = np.where(has_prior, index.range_max(first, np.maximum(idx - 1, first)), -np.inf)
+    vol_sum = index.range_sum(first, idx - 1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_vol = vol_sum / np.maximum(eff - 1, 1)
+        last_close, last_vol = h.close, h.volume
+        pct_over = np.where(max_high > 0, (last_close / max_high - 1.0) * 100, 0.0)
+        vol_ratio = np.where(avg_vol > 0, last_vol / avg_vol, 0.0)
+        hit = (
+            (eff >= max(window, 3))
+            & (last_close > max_high * (1 + breakout_threshold))
+            & (last_vol > avg_vol * volume_spike_ratio)
+            & (last_vol * last_close >= abs_dollar_volume_min)
+        )
+    return hit, pct_over, vol_ratio
+
+
+def find_alerts(h, bands, lookback, granularity, abs_dollar_volume_min, cooldown_sec=ALERT_COOLDOWN_SEC, evaluate=None):
+    """
+    Rows where at least one band fires, after the live per pair+band cooldown.
+    Returns (rows, {band name: bool array over rows}). `evaluate(window, thr,
+    ratio, floor)` may supply (possibly cached) raw band hits; they are not modified.
+    Bands on another granularity than the History's are left out.
+    """
+    if evaluate is None:
+        index = BandIndex(h, granularity)
+
+        def evaluate(window, thr, ratio, floor):
+            return evaluate_band(h, window, lookback, granularity, thr, ratio, floor, index=index)[0]
+    hits = {}
+    for band in bands:
+        if band.granularity not in (None, granularity):
+            print(f"⚠️ Skipping band {band.name}: {band.granularity}s candles, backtesting {granularity}s", flush=True)
+            continue
+        hits[band.name] = evaluate(band.window, band.threshold, band.ratio, band.floor(abs_dollar_volume_min)).copy()
+    # Cooldown is sequential per pair+band, but only over the (few) hit rows
+    for name, hit in hits.items():
+        last = {}
+        for i in np.flatnonzero(hit):
+            p = h.pair_idx[i]
+            alert_time = h.time[i] + granularity
+            if p in last and alert_time - last[p] < cooldown_sec:
+                hit[i] = False
+            else:
+                last[p] = alert_time
+    any_hit = np.zeros(len(h), dtype=bool)
+    for hit in hits.values():
+        any_hit |= hit
+    rows = np.flatnonzero(any_hit)
+    return rows, {name: hit[rows] for name, hit in hits.items()}
+
+
+def simulate_trades(h, rows, granularity, tp_pct, sl_pct, fee_pct, lookahead_min, entry_delay):
+    """
+    One long trade per alert row, all at once. Entry is the alert candle's close,
+    or with a delay the open of the first candle starting at/after close + delay.
+    Exit is the first candle in the lookahead whose low/high touches SL/TP (SL
+    wins a tie, conservatively), else that window's last close.
+    """
+    m = len(rows)
+    pair_end = h.ends[h.pair_idx[rows]]
+    alert_time = h.time[rows] + granularity
+    entry_time = alert_time + entry_delay
+
+    if entry_delay > 0:
+        entry_row = rows + 1
+        for step in range(int(np.ceil(entry_delay / granularity)) + 1):
+            late = (entry_row < pair_end) & (h.time[np.minimum(entry_row, len(h) - 1)] < entry_time)
+            entry_row = np.where(late, entry_row + 1, entry_row)
+        valid = entry_row < pair_end
+        safe = np.minimum(entry_row, len(h) - 1)
+        entry_price = np.where(valid, h.open[safe], np.nan)
+        entry_time = np.where(valid, h.time[safe], np.nan)
+        scan_from = entry_row
+    else:
+        valid = np.ones(m, dtype=bool)
+        entry_price = h.close[rows]
+        scan_from = rows + 1
+
+    steps = max(1, lookahead_min * 60 // granularity)
+    look = scan_from[:, None] + np.arange(steps)[None, :]
+    safe = np.minimum(look, len(h) - 1)
+    in_window = (look < pair_end[:, None]) & (h.time[safe] < (entry_time + lookahead_min * 60)[:, None])
+
+    tp_level = entry_price * (1 + tp_pct)
+    sl_level = entry_price * (1 - sl_pct)
+    sl_hit = in_window & (h.low[safe] <= sl_level[:, None])
+    tp_hit = in_window & (h.high[safe] >= tp_level[:, None])
+    touched = sl_hit | tp_hit
+    first = np.argmax(touched, axis=1)
+    any_touch = touched[np.arange(m), first]
+    last_in = np.maximum(in_window.sum(axis=1) - 1, 0)
+
+    exit_col = np.where(any_touch, first, last_in)
+    exit_row = safe[np.arange(m), exit_col]
+    is_sl = any_touch & sl_hit[np.arange(m), first]
+    is_tp = any_touch & ~is_sl
+    has_bars = in_window.any(axis=1) & valid
+
+    exit_price = np.where(is_sl, sl_level, np.where(is_tp, tp_level, h.close[exit_row]))
+    exit_time = h.time[exit_row] + granularity
+    outcome = np.where(~has_bars, "OPEN", np.where(is_sl, "SL", np.where(is_tp, "TP", "TIMEOUT")))
+    pnl = np.where(has_bars, exit_price * (1 - fee_pct) / (entry_price * (1 + fee_pct)) - 1.0, np.nan)
+    return {
+        "alert_time": alert_time,
+        "entry_time": entry_time,
+        "entry_price": entry_price,
+        "exit_time": np.where(has_bars, exit_time, np.nan),
+        "exit_price": np.where(has_bars, exit_price, np.nan),
+        "outcome": outcome,
+        "pnl": pnl,
+    }
+
+
+def summarize(trades, band_hits):
+    """Hit rate and expectancy for all alerts and per band."""
+    groups = [("ALL", np.ones(len(trades["pnl"]), dtype=bool))] + list(band_hits.items())
+    rows = []
+    for name, mask in groups:
+        closed = mask & (trades["outcome"] != "OPEN")
+        pnl = trades["pnl"][closed]
+        wins = int((pnl > 0).sum())
+        rows.append({
+            "group": name,
+            "alerts": int(mask.sum()),
+            "trades": int(closed.sum()),
+            "tp": int((mask & (trades["outcome"] == "TP")).sum()),
+            "sl": int((mask & (trades["outcome"] == "SL")).sum()),
+            "timeout": int((mask & (trades["outcome"] == "TIMEOUT")).sum()),
+            "hit_rate": round(wins / len(pnl), 4) if len(pnl) else 0.0,
+            "expectancy_pct": round(float(pnl.mean()) * 100, 4) if len(pnl) else 0.0,
+            "total_pnl_pct": round(float(pnl.sum()) * 100, 4) if len(pnl) else 0.0,
+        })
+    return rows
+
+
+def _iso(t):
+    return datetime.fromtimestamp(t, tz=timezone.utc).isoformat() if np.isfinite(t) else ""
+
+
+def write_alerts_csv(path, h, rows, band_hits, trades):
+    names = list(band_hits)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["alert_time", "pair", "bands", "close", "usd_per_min", "entry_time", "entry_price",
+                    "exit_time", "exit_price", "outcome", "pnl_pct"])
+        for j, i in enumerate(rows):
+            bands = "+".join(n for n in names if band_hits[n][j])
+            w.writerow([
+                _iso(trades["alert_time"][j]), h.pairs[h.pair_idx[i]], bands,
+                f"{h.close[i]:.8g}", f"{h.close[i] * h.volume[i]:.2f}",
+                _iso(trades["entry_time"][j]), f"{trades['entry_price'][j]:.8g}",
+                _iso(trades["exit_time"][j]), f"{trades['exit_price'][j]:.8g}",
+                trades["outcome"][j], f"{trades['pnl'][j] * 100:.4f}" if np.isfinite(trades["pnl"][j]) else "",
+            ])
+
+
+def write_results_csv(path, summary):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(summary[0]))
+        w.writeheader()
+        w.writerows(summary)
+
+
+def run_backtest(h, params, bands=None, lookback=None, abs_dollar_volume_min=None, evaluate=None):
+    """Alerts, trades and summary for one History. Pure computation; no files written."""
+    bands = settings.BANDS if bands is None else bands
+    lookback = settings.history_periods(bands) if lookback is None else lookback
+    abs_min = settings.ABSOLUTE_DOLLAR_VOLUME_MIN if abs_dollar_volume_min is None else abs_dollar_volume_min
+    g = params["granularity"]
+    rows, band_hits = find_alerts(h, bands, lookback, g, abs_min, evaluate=evaluate)
+    trades = simulate_trades(
+        h, rows, g, params["tp_pct"], params["sl_pct"], params["fee_pct"],
+        params["lookahead_min"], params["entry_delay"],
+    )
+    return rows, band_hits, trades, summarize(trades, band_hits)
+
+
+def backfill(archive, pairs, granularity, start, end):
+    """Top up the archive over REST (300 candles per request) from its newest candle, or `start`, to `end`."""
+    from .http_session import get_session
+
+    session = get_session()
+    span = 300 * granularity
+    for n, pair in enumerate(pairs, 1):
+        last = archive.last_time(pair, granularity)
+        t = start if last is None else max(start, last + granularity)
+        while t < end:
+            chunk_end = min(t + span, end)
+            params = {
+                "granularity": granularity,
+                "start": datetime.fromtimestamp(t, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+                "end": datetime.fromtimestamp(chunk_end, tz=timezone.utc).isoformat().replace("+00:00", "Z"),
+            }
+            try:
+                response = session.get(f"{settings.BASE_URL}/products/{pair}/candles", params=params, timeout=10)
+            except Exception as e:
+                print(f"❌ Exception fetching candles for {pair}: {e}", flush=True)
+                break
+            if response.status_code != 200:
+                print(f"❌ Error fetching candles for {pair}: HTTP {response.status_code}", flush=True)
+                break
+            data = response.json()
+            archive.append(pair, granularity, [c for c in data if c[0] + granularity <= end])
+            t = chunk_end
+        print(f"Backfilled {n}/{len(pairs)} {pair}", flush=True)
+
+
+def main(argv=None):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    params = load_params()
+
+    ap = argparse.ArgumentParser(prog="resonance.backtest", description="Backtest the breakout bands on archived candles")
+    ap.add_argument("--hours", type=int, default=params["lookback_hours"], help="History to replay (default: LOOKBACK_HOURS)")
+    ap.add_argument("--archive", default=CANDLE_STORE_DIR or "data/candles", help="Candle archive directory")
+    ap.add_argument("--pairs", nargs="*", help="Pairs to test (default: every pair in the archive)")
+    ap.add_argument("--backfill", action="store_true", help="Fetch missing history over REST before testing")
+    args = ap.parse_args(argv)
+
+    g = params["granularity"]
+    archive = CandleArchive(args.archive)
+    end = (time.time() // g) * g
+    start = end - args.hours * 3600
+    pairs = args.pairs or archive.symbols(g) or settings.COINS + settings.USDC_ONLY_COINS
+    if args.backfill:
+        backfill(archive, pairs, g, start, end)
+
+    t0 = time.monotonic()
+    h = History.from_archive(archive, pairs, g, start, end)
+    t1 = time.monotonic()
+    if not len(h):
+        print(f"No archived candles in {args.archive} for the last {args.hours}h (try --backfill)")
+        return
+    rows, band_hits, trades, summary = run_backtest(h, params)
+    t2 = time.monotonic()
+
+    write_alerts_csv(params["alerts_csv"], h, rows, band_hits, trades)
+    write_results_csv(params["results_csv"], summary)
+
+    print(f"Loaded {len(h):,} candles for {len(h.pairs)} pairs in {t1 - t0:.2f}s; "
+          f"replayed in {t2 - t1:.2f}s -> {len(rows)} alerts")
+    print(f"TP {params['tp_pct']:.2%} | SL {params['sl_pct']:.2%} | fee {params['fee_pct']:.3%}/side | "
+          f"lookahead {params['lookahead_min']}m | entry delay {params['entry_delay']}s")
+    for r in summary:
+        print(f"  {r['group']:<7} alerts {r['alerts']:>5} | TP {r['tp']:>4} SL {r['sl']:>4} timeout {r['timeout']:>4} | "
+              f"hit rate {r['hit_rate']:.1%} | expectancy {r['expectancy_pct']:+.3f}%")
+    for j in range(min(params["show_samples"], len(rows))):
+        i = rows[j]
+        print(f"  e.g. {h.pairs[h.pair_idx[i]]} @ {_iso(trades['alert_time'][j])}: "
+              f"{trades['outcome'][j]} {trades['pnl'][j] * 100:+.2f}%")
+    print(f"Wrote {params['alerts_csv']} and {params['results_csv']}")
+
+
+if __name__ == "__main__":
+    main()
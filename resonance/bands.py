@@ -0,0 +1,210 @@
+# Band registry and the per-pair band engine.
+# A band is one breakout rule: the newest candle closes more than `threshold`
+# above the highest high of the `window` - 1 candles before it, on more than
+# `ratio` times their average volume, with at least `volume_floor` $/min traded.
+# Bands come from the BANDS env var or the WebUI (see settings.py), so any number
+# of them can be configured, each on its own candle granularity.
+#
+# Every band only needs two things from the candles before the newest one: the
+# highest high and the volume sum over its window. BandFrame computes both as
+# running values from the newest candle back, once per pair and granularity, so
+# a band over n candles is a lookup at entry n - 2 and extra bands cost next to
+# nothing. batch_eval.py and backtest.py build the same structures in NumPy.
+from array import array
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+
+from .candle_store import FIELDS, CandleWindow
+
+# Band fields in BANDS spec order: NAME:window:threshold:ratio[:volume_floor[:granularity]]
+SPEC_FIELDS = ("name", "window", "threshold", "ratio", "volume_floor", "granularity")
+
+
+@dataclass(frozen=True)
+class Band:
+    name: str
+    window: int                    # candles, including the newest
+    threshold: float               # close over the prior max high, as a fraction
+    ratio: float                   # newest volume over the prior average
+    volume_floor: float = None     # $/min; None = the global ABS_VOL_MIN_USD floor
+    granularity: int = None        # candle seconds; None = CANDLE_INTERVAL
+
+    def floor(self, default):
+        return default if self.volume_floor is None else self.volume_floor
+
+    def span(self, base):
+        """Base-granularity candles this band needs."""
+        g = self.granularity or base
+        if g % base:
+            raise ValueError(f"band {self.name}: granularity {g}s is not a multiple of the {base}s candles")
+        return self.window * (g // base)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def make_band(name, window, threshold, ratio, volume_floor=None, granularity=None):
+    """A Band from loosely typed values (env spec strings, WebUI JSON)."""
+    blank = (None, "")
+    try:
+        band = Band(
+            name=str(name).strip().upper(),
+            window=int(window),
+            threshold=float(threshold),
+            ratio=float(ratio),
+            volume_floor=None if volume_floor in blank else float(volume_floor),
+            granularity=None if granularity in blank else int(granularity),
+        )
+    except (TypeError, ValueError):
+        raise ValueError(f"band {name}: window, threshold, ratio, volume_floor and granularity must be numbers") from None
+    if not band.name or band.window < 3:
+        raise ValueError(f"band {band.name or '?'}: needs a name and a window of at least 3 candles")
+    if band.threshold <= 0 or band.ratio <= 0:
+        raise ValueError(f"band {band.name}: threshold and ratio must be positive")
+    return band
+
+
+def check_names(bands):
+    """Reject duplicate band names: results, alerts and cooldowns are keyed by name."""
+    seen = set()
+    for band in bands:
+        if band.name in seen:
+            raise ValueError(f"band {band.name}: defined more than once")
+        seen.add(band.name)
+    return bands
+
+
+def parse_bands(spec):
+    """'FAST:10:0.013:1.3,HOURLY:12:0.03:2:5000:300' -> [Band, ...] ([] for an empty spec)."""
+    bands = []
+    for item in spec.split(","):
+        if item.strip():
+            values = [v.strip() for v in item.split(":")]
+            if not 4 <= len(values) <= len(SPEC_FIELDS):
+                raise ValueError(f"band spec {item.strip()!r}: expected NAME:window:threshold:ratio[:volume_floor[:granularity]]")
+            bands.append(make_band(*values))
+    return check_names(bands)
+
+
+def bands_from_dicts(items):
+    """Bands from a list of {name, window, threshold, ratio[, volume_floor, granularity]} dicts."""
+    if not isinstance(items, list):
+        raise ValueError("bands: expected a BANDS spec string or a list of band objects")
+    bands = []
+    for d in items:
+        if not isinstance(d, dict):
+            raise ValueError(f"bands: expected a band object, got {d!r}")
+        missing = [k for k in SPEC_FIELDS[:4] if k not in d]
+        if missing:
+            raise ValueError(f"band {d.get('name', '?')}: missing {', '.join(missing)}")
+        bands.append(make_band(**{k: d[k] for k in SPEC_FIELDS if k in d}))
+    return check_names(bands)
+
+
+def required_history(bands, base):
+    """Base-granularity candles a band set needs per pair: its longest span."""
+    return max((b.span(base) for b in bands), default=0)
+
+
+def resample(candles, granularity):
+    """
+    Aggregate candles (oldest first) into `granularity`-second candles aligned to
+    multiples of it. The newest one may still be partial, like the forming base candle.
+    """
+    cols = [array("d") for _ in FIELDS]
+    times, lows, highs, _, closes, volumes = cols
+    for t, low, high, open_, close, vol in candles:
+        bucket = t - t % granularity
+        if times and times[-1] == bucket:
+            if low < lows[-1]:
+                lows[-1] = low
+            if high > highs[-1]:
+                highs[-1] = high
+            closes[-1] = close
+            volumes[-1] += vol
+        else:
+            for col, value in zip(cols, (bucket, low, high, open_, close, vol)):
+                col.append(value)
+    return CandleWindow([memoryview(col) for col in cols])
+
+
+class BandFrame:
+    """
+    One pair's candles at one granularity, ready for any number of bands.
+    max_high[k] / vol_sum[k]: highest high / volume sum of the k + 1 candles
+    before the newest one.
+    """
+
+    __slots__ = ("length", "last_close", "last_vol", "max_high", "vol_sum")
+
+    def __init__(self, candles):
+        self.length = len(candles)
+        if isinstance(candles, CandleWindow):
+            highs, closes, volumes = candles.high, candles.close, candles.volume
+        else:
+            highs   = [c[2] for c in candles]
+            closes  = [c[4] for c in candles]
+            volumes = [c[5] for c in candles]
+        if self.length:
+            self.last_close = closes[-1]
+            self.last_vol = volumes[-1]
+            self.max_high = list(accumulate(reversed(highs[:-1]), max))
+            self.vol_sum = list(accumulate(reversed(volumes[:-1])))
+
+    def evaluate(self, window, breakout_threshold, volume_spike_ratio, abs_dollar_volume_min):
+        """is_breakout_band() on the newest `window` candles; (False, None) until there are that many."""
+        if self.length < max(window, 3):
+            return False, None
+
+        max_high    = self.max_high[window - 2]
+        last_close  = self.last_close
+        avg_vol     = self.vol_sum[window - 2] / (window - 1)
+        last_vol    = self.last_vol
+        usd_per_min = last_vol * last_close
+
+        pct_over    = ((last_close / max_high) - 1.0) * 100 if max_high > 0 else 0.0
+        vol_ratio   = (last_vol / avg_vol) if avg_vol > 0 else 0.0
+
+        hit = (
+            last_close > max_high * (1 + breakout_threshold) and
+            last_vol   > avg_vol   * volume_spike_ratio and
+            usd_per_min >= abs_dollar_volume_min
+        )
+
+        info = {
+            "window": window,
+            "last_close": float(last_close),
+            "max_high": float(max_high),
+            "pct_over": float(pct_over),
+            "last_vol": float(last_vol),
+            "avg_vol": float(avg_vol),
+            "vol_ratio": float(vol_ratio),
+            "usd_per_min": float(usd_per_min),
+        }
+        return hit, info
+
+
+def evaluate_pair(candles, bands, base_granularity, abs_dollar_volume_min):
+    """
+    Evaluate one pair's base-granularity candles against every band, with one
+    BandFrame per granularity over just the candles its longest band needs.
+    Returns [(band, hit, info), ...] in band order.
+    """
+    depth = {}
+    for band in bands:
+        g = band.granularity or base_granularity
+        depth[g] = max(depth.get(g, 0), band.window)
+    frames = {}
+    results = []
+    for band in bands:
+        g = band.granularity or base_granularity
+        frame = frames.get(g)
+        if frame is None:
+            if g == base_granularity:
+                frame = BandFrame(candles[-depth[g]:])
+            else:
+                frame = BandFrame(resample(candles[-depth[g] * (g // base_granularity):], g))
+            frames[g] = frame
+        hit, info = frame.evaluate(band.window, band.threshold, band.ratio, band.floor(abs_dollar_volume_min))
+        results.append((band, hit, info))
+    return results
@@ -0,0 +1,179 @@
+# Vectorized breakout evaluation across the whole symbol universe.
+# Candle windows for every symbol are packed into (symbols x candles) NumPy
+# matrices, right-aligned so the last column is each symbol's newest candle
+# (shorter histories are NaN-padded on the left). The running max of the highs
+# and sum of the volumes before the newest candle are computed once per matrix
+# (the NumPy form of bands.BandFrame), so each band is a column lookup instead
+# of one Python is_breakout_band() call per symbol per band, and it yields the
+# same fields as is_breakout_band's info dict.
+import numpy as np
+
+from .bands import resample
+from .detection import READINESS_CAP
+
+
+class CandleMatrix:
+    """Right-aligned, NaN-padded (symbols x candles) matrices of highs/lows/closes/volumes."""
+
+    def __init__(self, highs, lows, closes, volumes, lengths):
+        self.highs = highs
+        self.lows = lows
+        self.closes = closes
+        self.volumes = volumes
+        self.lengths = lengths
+        self._runs = None
+
+    @classmethod
+    def from_windows(cls, windows, width=None):
+        """Pack CandleWindows (or legacy row lists) into matrices `width` candles wide."""
+        lengths = np.array([len(w) for w in windows], dtype=np.int64)
+        if width is None:
+            width = int(lengths.max()) if len(windows) else 0
+        shape = (len(windows), width)
+        highs = np.full(shape, np.nan)
+        lows = np.full(shape, np.nan)
+        closes = np.full(shape, np.nan)
+        volumes = np.full(shape, np.nan)
+
+        for i, w in enumerate(windows):
+            n = min(len(w), width)
+            if not n:
+                continue
+            if hasattr(w, "high"):
+                # CandleWindow columns are memoryviews over array('d'): read them without copying
+                highs[i, width - n:] = np.frombuffer(w.high, dtype=np.float64)[-n:]
+                lows[i, width - n:] = np.frombuffer(w.low, dtype=np.float64)[-n:]
+                closes[i, width - n:] = np.frombuffer(w.close, dtype=np.float64)[-n:]
+                volumes[i, width - n:] = np.frombuffer(w.volume, dtype=np.float64)[-n:]
+            else:
+                rows = np.asarray(w[-n:], dtype=np.float64)
+                lows[i, width - n:] = rows[:, 1]
+                highs[i, width - n:] = rows[:, 2]
+                closes[i, width - n:] = rows[:, 4]
+                volumes[i, width - n:] = rows[:, 5]
+
+        return cls(highs, lows, closes, volumes, np.minimum(lengths, width))
+
+    @property
+    def width(self):
+        return self.highs.shape[1]
+
+    def prior_runs(self):
+        """
+        (max_high, vol_sum): column k holds each symbol's highest high / volume
+        sum over the k + 1 candles before its newest one. Computed once, shared by every band.
+        """
+        if self._runs is None:
+            prior_highs = self.highs[:, :-1][:, ::-1]
+            prior_vols = np.nan_to_num(self.volumes[:, :-1][:, ::-1])
+            self._runs = (np.fmax.accumulate(prior_highs, axis=1), np.cumsum(prior_vols, axis=1))
+        return self._runs
+
+
+class BandResult:
+    """Per-symbol arrays for one band; info(i) rebuilds is_breakout_band's info dict."""
+
+    FIELDS = ("window", "last_close", "max_high", "pct_over", "last_vol", "avg_vol", "vol_ratio", "usd_per_min")
+
+    def __init__(self, hit, required=3, **arrays):
+        self.hit = hit
+        self.required = required     # candles the band needs before it is evaluated
+        for name in self.FIELDS:
+            setattr(self, name, arrays[name])
+
+    def info(self, i):
+        if self.window[i] < self.required:
+            return None
+        info = {name: float(getattr(self, name)[i]) for name in self.FIELDS}
+        info["window"] = int(self.window[i])
+        return info
+
+
+def sweep_metrics(m):
+    """Δ (percent_change) and W (band_width) over each symbol's full window."""
+    first_idx = (m.width - np.maximum(m.lengths, 1))[:, None]
+    start = np.take_along_axis(m.closes, first_idx, axis=1)[:, 0]
+    end = m.closes[:, -1]
+    percent_change = (end - start) / start * 100
+    band_width = (np.fmax.reduce(m.highs, axis=1) - np.fmin.reduce(m.lows, axis=1)) / end * 100
+    return percent_change, band_width
+
+
+def evaluate_band(m, window, breakout_threshold, volume_spike_ratio, abs_dollar_volume_min):
+    """
+    Evaluate one band for every symbol at once, with is_breakout_band semantics
+    on the last `window` candles. As in detection.assess_bands, a symbol with
+    fewer than `window` candles is not evaluated for this band.
+    """
+    required = max(window, 3)
+    eff = np.minimum(m.lengths, window)
+    k = min(window, m.width) - 2
+    if k >= 0:
+        run_max, run_sum = m.prior_runs()
+        max_high, vol_sum = run_max[:, k], run_sum[:, k]
+    else:
+        max_high, vol_sum = np.full(len(eff), np.nan), np.zeros(len(eff))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_vol = vol_sum / np.maximum(eff - 1, 1)
+        last_close = m.closes[:, -1]
+        last_vol = m.volumes[:, -1]
+        usd_per_min = last_vol * last_close
+
+        pct_over = np.where(max_high > 0, (last_close / max_high - 1.0) * 100, 0.0)
+        vol_ratio = np.where(avg_vol > 0, last_vol / avg_vol, 0.0)
+
+        hit = (
+            (eff >= required)
+            & (last_close > max_high * (1 + breakout_threshold))
+            & (last_vol > avg_vol * volume_spike_ratio)
+            & (usd_per_min >= abs_dollar_volume_min)
+        )
+
+    return BandResult(
+        hit,
+        required=required,
+        window=eff,
+        last_close=last_close,
+        max_high=max_high,
+        pct_over=pct_over,
+        last_vol=last_vol,
+        avg_vol=avg_vol,
+        vol_ratio=vol_ratio,
+        usd_per_min=usd_per_min,
+    )
+
+
+def bands_readiness(results, bands, cap=READINESS_CAP):
+    """
+    Per-symbol readiness of the closest band, as detection.band_readiness;
+    NaN where no band has enough candles.
+    """
+    best = None
+    for band in bands:
+        res = results[band.name]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = np.minimum(np.minimum(res.pct_over / (band.threshold * 100), res.vol_ratio / band.ratio), cap)
+        r = np.where(res.window >= res.required, r, np.nan)
+        best = r if best is None else np.fmax(best, r)
+    return best
+
+
+def evaluate_bands(m, bands, abs_dollar_volume_min, windows=None, base_granularity=None):
+    """
+    bands: iterable of bands.Band. Returns {name: BandResult} in band order.
+    Bands on a coarser granularity than `base_granularity` are evaluated on one
+    matrix per granularity, resampled from `windows` (the windows `m` was built from).
+    """
+    matrices = {None: m, base_granularity: m}
+    results = {}
+    for band in bands:
+        g = band.granularity
+        if g not in matrices:
+            if windows is None:
+                raise ValueError(f"band {band.name}: {g}s candles need the source windows")
+            matrices[g] = CandleMatrix.from_windows([resample(w, g) for w in windows])
+        results[band.name] = evaluate_band(
+            matrices[g], band.window, band.threshold, band.ratio, band.floor(abs_dollar_volume_min),
+        )
+    return results
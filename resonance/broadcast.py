@@ -0,0 +1,185 @@
+# Per-client broadcast with backpressure for the WebUI.
+# socketio.emit() to everyone hands each packet to the server's unbounded
+# per-connection buffers, so one slow dashboard makes memory grow without limit.
+# Broadcaster instead gives every client a small outbound queue and a pump task
+# that sends one event at a time and waits for the client's ack before the next:
+#   - "latest" events (scan_update, stats_update, scanner_status) keep only the
+#     newest snapshot per event name; a merge function can fold the superseded
+#     snapshot into the new one instead of discarding it.
+#   - "reliable" events (breakout_alert) are never dropped or reordered. A client
+#     that lets WEBUI_CLIENT_QUEUE of them pile up is disconnected as a slow
+#     consumer (the dashboard reconnects and resynchronises).
+import os
+import threading
+import time
+from collections import deque
+
+WEBUI_CLIENT_QUEUE = int(os.getenv("WEBUI_CLIENT_QUEUE", "64"))       # reliable events held per client
+WEBUI_ACK_TIMEOUT = float(os.getenv("WEBUI_ACK_TIMEOUT", "10"))       # seconds to wait for a client ack
+
+LATEST = "latest"
+RELIABLE = "reliable"
+
+
+class _Client:
+    def __init__(self, sid):
+        self.sid = sid
+        self.latest = {}             # event -> newest payload
+        self.reliable = deque()      # (event, payload), oldest first
+        self.cond = threading.Condition()
+        self.closed = False
+        self.last_sent = {}          # event -> monotonic time of the last send
+        self.sent = 0
+        self.coalesced = 0
+        self.ack_timeouts = 0
+        self.ack_ms = 0.0            # last ack round trip
+        self.max_depth = 0
+
+    def depth(self):
+        return len(self.latest) + len(self.reliable)
+
+
+class Broadcaster:
+    """
+    send(event, payload, sid, callback) emits to one client and arranges for
+    callback() to run when the client acks; spawn(fn, *args) starts a
+    background thread (pumps block on threading primitives, so not a
+    greenlet); disconnect(sid) drops a client.
+    """
+
+    def __init__(
+        self,
+        send,
+        spawn,
+        disconnect=None,
+        policies=None,
+        mergers=None,
+        min_interval=None,
+        max_queue=WEBUI_CLIENT_QUEUE,
+        ack_timeout=WEBUI_ACK_TIMEOUT,
+    ):
+        self._send = send
+        self._spawn = spawn
+        self._disconnect = disconnect
+        self.policies = dict(policies or {})          # event -> LATEST | RELIABLE (default LATEST)
+        self.mergers = dict(mergers or {})            # event -> merge(old_payload, new_payload)
+        self.min_interval = dict(min_interval or {})  # event -> min seconds between sends per client
+        self.max_queue = max_queue
+        self.ack_timeout = ack_timeout
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.slow_disconnects = 0
+
+    def add_client(self, sid):
+        client = _Client(sid)
+        with self._lock:
+            self._clients[sid] = client
+        self._spawn(self._pump, client)
+
+    def remove_client(self, sid):
+        with self._lock:
+            client = self._clients.pop(sid, None)
+        if client is not None:
+            with client.cond:
+                client.closed = True
+                client.cond.notify()
+
+    def publish(self, event, payload, sid=None):
+        """Queue `event` for every client (or just `sid`)."""
+        with self._lock:
+            clients = list(self._clients.values()) if sid is None else [self._clients.get(sid)]
+        for client in clients:
+            if client is not None:
+                self._enqueue(client, event, payload)
+
+    def _enqueue(self, client, event, payload):
+        slow = False
+        with client.cond:
+            if client.closed:
+                return
+            if self.policies.get(event, LATEST) == RELIABLE:
+                if len(client.reliable) >= self.max_queue:
+                    slow = True
+                else:
+                    client.reliable.append((event, payload))
+            else:
+                prev = client.latest.pop(event, None)
+                if prev is not None:
+                    client.coalesced += 1
+                    merge = self.mergers.get(event)
+                    if merge is not None:
+                        payload = merge(prev, payload)
+                client.latest[event] = payload
+            client.max_depth = max(client.max_depth, client.depth())
+            client.cond.notify()
+        if slow:
+            self._drop_slow(client)
+
+    def _drop_slow(self, client):
+        print(f"⚠️ WebUI client {client.sid} is not keeping up; disconnecting", flush=True)
+        self.slow_disconnects += 1
+        self.remove_client(client.sid)
+        if self._disconnect is not None:
+            try:
+                self._disconnect(client.sid)
+            except Exception as e:
+                print(f"WebUI disconnect error: {e}")
+
+    def _next(self, client):
+        """Pop the next event to send, or return (None, wait_seconds). Alerts go first."""
+        if client.reliable:
+            return client.reliable.popleft(), 0.0
+        now = time.monotonic()
+        wait = None
+        for event in client.latest:
+            due = client.last_sent.get(event, 0.0) + self.min_interval.get(event, 0.0)
+            if due <= now:
+                return (event, client.latest.pop(event)), 0.0
+            wait = due - now if wait is None else min(wait, due - now)
+        return None, wait
+
+    def _pump(self, client):
+        acked = threading.Event()
+        while True:
+            with client.cond:
+                while True:
+                    if client.closed:
+                        return
+                    item, wait = self._next(client)
+                    if item is not None:
+                        break
+                    client.cond.wait(wait)
+            event, payload = item
+
+            acked.clear()
+            sent_at = time.monotonic()
+            client.last_sent[event] = sent_at
+            try:
+                self._send(event, payload, client.sid, acked.set)
+            except Exception as e:
+                print(f"WebUI emit error: {e}")
+                continue
+            client.sent += 1
+            # One event in flight per client: the next send waits for this ack
+            if acked.wait(self.ack_timeout):
+                client.ack_ms = (time.monotonic() - sent_at) * 1000
+            else:
+                client.ack_timeouts += 1
+
+    def metrics(self):
+        """Per-client queue depth and delivery counters."""
+        with self._lock:
+            clients = list(self._clients.values())
+        out = {}
+        for c in clients:
+            with c.cond:
+                out[c.sid] = {
+                    "queue_depth": c.depth(),
+                    "max_queue_depth": c.max_depth,
+                    "pending_alerts": len(c.reliable),
+                    "sent": c.sent,
+                    "coalesced": c.coalesced,
+                    "ack_timeouts": c.ack_timeouts,
+                    "ack_ms": round(c.ack_ms, 1),
+                }
+        return {"clients": out, "slow_disconnects": self.slow_disconnects}
@@ -0,0 +1,128 @@
+# Persistent on-disk candle store.
+# Closed candles are appended to fixed-width binary files, one per symbol per UTC
+# day: <root>/<granularity>/<SYMBOL>/<YYYY-MM-DD>.f8, each record six little-endian
+# float64s in the usual [time, low, high, open, close, volume] order. Files are
+# append-only and sorted by time, so range reads are a numpy.memmap plus a binary
+# search on the time column, with no parsing. Writing needs only the standard
+# library; numpy is imported when something is read.
+import calendar
+import os
+import sys
+import threading
+import time
+from array import array
+from pathlib import Path
+
+from .candle_store import FIELDS
+
+CANDLE_STORE_DIR = os.getenv("CANDLE_STORE_DIR", "")    # opt-in; empty = don't persist candles
+
+RECORD_FIELDS = len(FIELDS)
+RECORD_BYTES = RECORD_FIELDS * 8
+DAY = 86400
+
+
+def _day(t):
+    return time.strftime("%Y-%m-%d", time.gmtime(t))
+
+
+class CandleArchive:
+    def __init__(self, root=CANDLE_STORE_DIR):
+        self.root = Path(root)
+        self._last = {}          # (symbol, granularity) -> newest stored candle time
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol, granularity):
+        return self.root / str(granularity) / symbol
+
+    def _partitions(self, symbol, granularity):
+        """Day files for one symbol, oldest first."""
+        d = self._dir(symbol, granularity)
+        if not d.is_dir():
+            return []
+        return sorted(d.glob("*.f8"))
+
+    def symbols(self, granularity):
+        d = self.root / str(granularity)
+        return sorted(p.name for p in d.iterdir() if p.is_dir()) if d.is_dir() else []
+
+    def last_time(self, symbol, granularity):
+        """Time of the newest stored candle, or None."""
+        key = (symbol, granularity)
+        if key not in self._last:
+            last = None
+            for path in reversed(self._partitions(symbol, granularity)):
+                size = path.stat().st_size - path.stat().st_size % RECORD_BYTES
+                if size:
+                    with open(path, "rb") as f:
+                        f.seek(size - RECORD_BYTES)
+                        rec = array("d", f.read(RECORD_BYTES))
+                    if sys.byteorder == "big":
+                        rec.byteswap()
+                    last = rec[0]
+                    break
+            self._last[key] = last
+        return self._last[key]
+
+    def append(self, symbol, granularity, candles):
+        """
+        Append closed candles (any order). Candles at or before the newest stored
+        time are skipped, so re-fetched history is never written twice.
+        Returns the number of candles written.
+        """
+        with self._lock:
+            last = self.last_time(symbol, granularity)
+            rows = sorted((c for c in candles if last is None or c[0] > last), key=lambda c: c[0])
+            if not rows:
+                return 0
+
+            d = self._dir(symbol, granularity)
+            d.mkdir(parents=True, exist_ok=True)
+            by_day = {}
+            for c in rows:
+                by_day.setdefault(_day(c[0]), array("d")).extend(float(c[i]) for i in range(RECORD_FIELDS))
+            for day, buf in by_day.items():
+                if sys.byteorder == "big":
+                    buf.byteswap()   # records are little-endian on disk
+                with open(d / f"{day}.f8", "ab") as f:
+                    f.write(buf.tobytes())
+            self._last[(symbol, granularity)] = float(rows[-1][0])
+            return len(rows)
+
+    def read(self, symbol, granularity, start=None, end=None):
+        """
+        Candles with start <= time < end as an (n, 6) float64 array, oldest first.
+        A range inside one day is a read-only view of the memory-mapped file.
+        """
+        import numpy as np
+
+        parts = []
+        for path in self._partitions(symbol, granularity):
+            day_start = calendar.timegm(time.strptime(path.stem, "%Y-%m-%d"))
+            if (end is not None and day_start >= end) or (start is not None and day_start + DAY <= start):
+                continue
+            n = path.stat().st_size // RECORD_BYTES
+            if not n:
+                continue
+            m = np.memmap(path, dtype="<f8", mode="r", shape=(n, RECORD_FIELDS))
+            times = m[:, 0]
+            lo = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            hi = n if end is None else int(np.searchsorted(times, end, side="left"))
+            if hi > lo:
+                parts.append(m[lo:hi])
+        if not parts:
+            return np.empty((0, RECORD_FIELDS))
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_archive():
+    """Return the process-wide archive, or None when CANDLE_STORE_DIR is empty."""
+    global _archive
+    if _archive is None and CANDLE_STORE_DIR:
+        with _archive_lock:
+            if _archive is None:
+                _archive = CandleArchive(CANDLE_STORE_DIR)
+    return _archive
@@ -0,0 +1,75 @@
+# Per-symbol candle cache for delta fetches.
+# get_candles() asks the exchange only for candles from the last cached timestamp
+# onwards, merges them here (the in-progress candle is replaced, not duplicated)
+# and reads the band window back out instead of re-downloading it every cycle.
+import threading
+
+from .candle_store import CandleRing, EMPTY_WINDOW
+
+
+class CandleCache:
+    """
+    Keeps the most recent `maxlen` candles per (product_id, granularity) in
+    array-backed ring buffers. Candles use the exchange layout:
+    [time, low, high, open, close, volume].
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def ring(self, product_id, granularity):
+        """The ring buffer for one symbol, created empty on first use."""
+        key = (product_id, granularity)
+        ring = self._rings.get(key)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(key, CandleRing(self.maxlen))
+        return ring
+
+    def resize(self, maxlen):
+        """
+        Grow every ring to hold `maxlen` candles, keeping what is cached. Never
+        shrinks. Safe while fetch workers are calling update().
+        """
+        if maxlen <= self.maxlen:
+            return
+        with self._lock:
+            self.maxlen = maxlen
+            for key, ring in list(self._rings.items()):
+                bigger = CandleRing(maxlen)
+                for row in ring.window():
+                    bigger.append(row)
+                self._rings[key] = bigger
+
+    def last_time(self, product_id, granularity):
+        """Timestamp of the newest cached candle, or None if nothing is cached."""
+        ring = self._rings.get((product_id, granularity))
+        return ring.last_time() if ring is not None else None
+
+    def update(self, product_id, granularity, candles):
+        """
+        Merge freshly fetched candles (any order) into the cache.
+        A candle with an already-cached timestamp replaces the cached one, so the
+        still-forming last candle is refreshed in place.
+        """
+        rows = sorted(candles, key=lambda c: c[0])
+        # Under the lock so a concurrent resize() can't copy the ring mid-merge
+        # and drop these candles with the old one
+        with self._lock:
+            ring = self._rings.get((product_id, granularity))
+            if ring is None:
+                ring = self._rings[(product_id, granularity)] = CandleRing(self.maxlen)
+            for c in rows:
+                ring.upsert(c)
+
+    def window(self, product_id, granularity, start_time=None, n=None):
+        """
+        Zero-copy CandleWindow of the newest n cached candles (all by default),
+        optionally only those at or after start_time.
+        """
+        ring = self._rings.get((product_id, granularity))
+        if ring is None:
+            return EMPTY_WINDOW
+        return ring.window(n, since=start_time)
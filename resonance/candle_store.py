@@ -0,0 +1,140 @@
+# Compact per-symbol candle storage.
+# Each symbol keeps a fixed-capacity ring of candles with one array('d') column per
+# field instead of a list of nested JSON lists. The columns are mirrored (every value
+# is written at slot i and i + capacity), so the last n candles are always one
+# contiguous slice and band windows are zero-copy memoryviews.
+from array import array
+
+FIELDS = ("time", "low", "high", "open", "close", "volume")
+
+
+class CandleWindow:
+    """
+    Read-only view of consecutive candles, oldest first.
+    Columns are memoryviews over the ring (`.time`, `.low`, `.high`, `.open`,
+    `.close`, `.volume`). It also behaves like the legacy list of
+    [time, low, high, open, close, volume] rows: len(), w[i] -> row tuple,
+    w[-n:] -> CandleWindow, iteration over rows.
+
+    Views are live: they reflect later writes to the ring, so read them before
+    the owning ring is updated again.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, columns):
+        for name, col in zip(FIELDS, columns):
+            setattr(self, name, col)
+
+    def _columns(self):
+        return (self.time, self.low, self.high, self.open, self.close, self.volume)
+
+    def __len__(self):
+        return len(self.time)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return CandleWindow([col[key] for col in self._columns()])
+        return tuple(col[key] for col in self._columns())
+
+    def __iter__(self):
+        return zip(*self._columns())
+
+    def tail(self, n):
+        """The last n candles (all of them if fewer), without copying."""
+        return self if n >= len(self) else self[-n:]
+
+    def rows(self):
+        """Copy out as a list of [time, low, high, open, close, volume] lists."""
+        return [list(row) for row in self]
+
+
+EMPTY_WINDOW = CandleWindow([memoryview(array("d"))] * len(FIELDS))
+
+
+class CandleRing:
+    """
+    Fixed-capacity ring buffer of candles for one symbol.
+    Single writer: fetch/ingest for a symbol must not overlap with other writes to it.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._cols = [array("d", bytes(8 * 2 * capacity)) for _ in FIELDS]
+        self._views = [memoryview(col) for col in self._cols]
+        self._head = 0   # slot the next appended candle goes to
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _slot(self, i):
+        """Ring slot of the i-th stored candle (0 = oldest, negative from newest)."""
+        if i < 0:
+            i += self._size
+        return (self._head - self._size + i) % self.capacity
+
+    def _write(self, slot, row):
+        mirror = slot + self.capacity
+        for col, value in zip(self._cols, row):
+            col[slot] = value
+            col[mirror] = value
+
+    def append(self, row):
+        self._write(self._head, row)
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self):
+        """Newest candle as a row tuple, or None when empty."""
+        if not self._size:
+            return None
+        slot = self._slot(-1)
+        return tuple(col[slot] for col in self._cols)
+
+    def last_time(self):
+        return self._cols[0][self._slot(-1)] if self._size else None
+
+    def upsert(self, row):
+        """
+        Store one candle in time order: newer than the newest is appended, an
+        existing timestamp is overwritten in place (e.g. the still-forming candle).
+        Older candles that are not held any more are ignored.
+        """
+        t = row[0]
+        last_t = self.last_time()
+        if last_t is None or t > last_t:
+            self.append(row)
+            return
+        times = self._cols[0]
+        for i in range(self._size - 1, -1, -1):
+            slot = self._slot(i)
+            if times[slot] == t:
+                self._write(slot, row)
+                return
+            if times[slot] < t:
+                return
+
+    def find(self, t):
+        """Row tuple for the candle starting at time t, or None."""
+        times = self._cols[0]
+        for i in range(self._size - 1, -1, -1):
+            slot = self._slot(i)
+            if times[slot] == t:
+                return tuple(col[slot] for col in self._cols)
+            if times[slot] < t:
+                return None
+        return None
+
+    def window(self, n=None, since=None):
+        """
+        Zero-copy view of the newest n candles (all by default), optionally
+        limited to candles whose time is >= since.
+        """
+        n = self._size if n is None else min(n, self._size)
+        if since is not None:
+            times = self._cols[0]
+            while n and times[self._slot(-n)] < since:
+                n -= 1
+        end = self._head + self.capacity
+        return CandleWindow([view[end - n:end] for view in self._views])
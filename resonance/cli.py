@@ -0,0 +1,49 @@
+# Command-line entry point: python -m resonance [--mode rest|stream] [--eval pair|batch] [--shards N] [--coord-db PATH]
+# (the WebUI runs the same engine in-process: python app.py)
+# Only the modules the chosen mode needs are imported.
+import argparse
+
+from . import settings
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="resonance", description="Resonance.ai breakout scanner")
+    ap.add_argument("--mode", choices=("rest", "stream"), default=settings.INGEST_MODE,
+                    help="Candle ingestion: poll REST or build candles from the WebSocket feed (default: INGEST_MODE)")
+    ap.add_argument("--eval", choices=("pair", "batch"), default=settings.EVAL_MODE,
+                    help="Evaluate pairs one by one or the whole sweep at once (default: EVAL_MODE)")
+    ap.add_argument("--shards", type=int, default=settings.SCAN_SHARDS,
+                    help="Scanner processes to split the pairs across (default: SCAN_SHARDS)")
+    ap.add_argument("--coord-db", default=settings.COORD_DB, metavar="PATH",
+                    help="Share the pairs with other instances through this SQLite file (default: COORD_DB)")
+    args = ap.parse_args(argv)
+    if args.coord_db and (args.mode != "rest" or args.shards > 1):
+        ap.error("--coord-db works with --mode rest and a single shard")
+
+    settings.INGEST_MODE = args.mode
+    settings.EVAL_MODE = args.eval
+
+    print(f"[Config] Absolute $/min volume floor = ${settings.ABSOLUTE_DOLLAR_VOLUME_MIN:,.0f}")
+    print("\n--- Resonance.ai Breakout Scanner Activated ---")
+    print(f"[Config] Ingest mode = {settings.INGEST_MODE} | Eval mode = {settings.EVAL_MODE} | "
+          f"Fetch concurrency = {settings.FETCH_CONCURRENCY} | Shards = {args.shards}")
+
+    try:
+        if args.coord_db:
+            from .coordinator import run_coordinated_scanner
+            run_coordinated_scanner(args.coord_db)
+        elif args.shards > 1:
+            from .sharding import run_sharded_scanner
+            run_sharded_scanner(args.shards)
+        elif settings.INGEST_MODE == "stream":
+            from .scanner import run_stream_scanner
+            run_stream_scanner()
+        else:
+            from .scanner import run_rest_scanner
+            run_rest_scanner()
+    except KeyboardInterrupt:
+        print("\n🛑 Scanner stopped by user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# Coordination between scanner instances over a shared SQLite file.
+# Several instances pointed at the same COORD_DB split the pair universe instead
+# of each scanning all of it. The universe is hashed into COORD_SLOTS slots
+# (hash ranges); every instance heartbeats, holds time-limited leases on an even
+# share of the slots and scans only the pairs in them. When an instance stops
+# heartbeating its leases expire and the others pick its slots up within
+# COORD_LEASE_SEC; when one joins, the others hand back their surplus.
+# Alerts are claimed in the same database before they are sent, keyed by pair,
+# band and candle, with the cooldown applied across instances, so a breakout is
+# sent once even while a slot is changing hands.
+import math
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .alert_coalescer import ALERT_COOLDOWN_SEC
+from .sharding import key_hash
+
+COORD_NODE_ID = os.getenv("COORD_NODE_ID", "")                       # default: <hostname>-<pid>
+COORD_SLOTS = int(os.getenv("COORD_SLOTS", "64"))                    # hash ranges the pairs are leased in
+COORD_LEASE_SEC = float(os.getenv("COORD_LEASE_SEC", "6"))           # lease lifetime; failover time
+COORD_HEARTBEAT_SEC = float(os.getenv("COORD_HEARTBEAT_SEC", "2"))   # lease renewal interval
+ALERT_CLAIM_RETENTION_SEC = 86400                                    # how long claimed alerts are kept
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    node_id   TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    slot    INTEGER PRIMARY KEY,
+    owner   TEXT,
+    expires REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS alerts (
+    pair        TEXT NOT NULL,
+    band        TEXT NOT NULL,
+    candle_time REAL NOT NULL,
+    node_id     TEXT NOT NULL,
+    at          REAL NOT NULL,
+    PRIMARY KEY (pair, band, candle_time)
+);
+CREATE INDEX IF NOT EXISTS alerts_recent ON alerts (pair, band, at);
+"""
+
+
+def slot_for(pair, slots=COORD_SLOTS):
+    return key_hash(pair) % slots
+
+
+class Coordinator:
+    def __init__(self, path, node_id=None, slots=COORD_SLOTS, lease_sec=COORD_LEASE_SEC,
+                 heartbeat_sec=COORD_HEARTBEAT_SEC, cooldown_sec=ALERT_COOLDOWN_SEC):
+        self.path = path
+        self.node_id = node_id or COORD_NODE_ID or f"{socket.gethostname()}-{os.getpid()}"
+        self.slots = slots
+        self.lease_sec = lease_sec
+        self.heartbeat_sec = heartbeat_sec
+        self.cooldown_sec = cooldown_sec
+        self.owned = frozenset()
+        self.valid_until = 0.0       # leases are known to be ours until then
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._db.executemany("INSERT OR IGNORE INTO leases (slot) VALUES (?)", [(s,) for s in range(slots)])
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._db)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def heartbeat(self, now=None):
+        """
+        Renew this node's leases and rebalance: take free or expired slots up to
+        an even share of the live nodes, give back any surplus. Returns the owned slots.
+        """
+        now = time.time() if now is None else now
+
+        def rebalance(db):
+            db.execute("INSERT INTO nodes (node_id, heartbeat) VALUES (?, ?) "
+                       "ON CONFLICT (node_id) DO UPDATE SET heartbeat = excluded.heartbeat", (self.node_id, now))
+            live = db.execute("SELECT COUNT(*) FROM nodes WHERE heartbeat > ?", (now - self.lease_sec,)).fetchone()[0]
+            share = math.ceil(self.slots / max(live, 1))
+
+            db.execute("UPDATE leases SET expires = ? WHERE owner = ? AND expires > ?",
+                       (now + self.lease_sec, self.node_id, now))
+            owned = [r[0] for r in db.execute(
+                "SELECT slot FROM leases WHERE owner = ? AND expires > ? ORDER BY slot", (self.node_id, now))]
+            if len(owned) > share:
+                surplus = owned[share:]
+                db.executemany("UPDATE leases SET owner = NULL, expires = 0 WHERE slot = ?", [(s,) for s in surplus])
+                owned = owned[:share]
+            elif len(owned) < share:
+                free = [r[0] for r in db.execute(
+                    "SELECT slot FROM leases WHERE owner IS NULL OR expires <= ? ORDER BY slot LIMIT ?",
+                    (now, share - len(owned)))]
+                db.executemany("UPDATE leases SET owner = ?, expires = ? WHERE slot = ?",
+                               [(self.node_id, now + self.lease_sec, s) for s in free])
+                owned += free
+
+            db.execute("DELETE FROM nodes WHERE heartbeat < ?", (now - 10 * self.lease_sec,))
+            db.execute("DELETE FROM alerts WHERE at < ?", (now - ALERT_CLAIM_RETENTION_SEC,))
+            return frozenset(owned)
+
+        self.owned = self._transaction(rebalance)
+        self.valid_until = now + self.lease_sec
+        return self.owned
+
+    def release(self):
+        """Give up every lease now, so the other instances take over without waiting for expiry."""
+        def drop(db):
+            db.execute("UPDATE leases SET owner = NULL, expires = 0 WHERE owner = ?", (self.node_id,))
+            db.execute("DELETE FROM nodes WHERE node_id = ?", (self.node_id,))
+        self._transaction(drop)
+        self.owned = frozenset()
+        self.valid_until = 0.0
+
+    def pairs_for(self, universe):
+        """The pairs of `universe` this node should scan (none once its leases may have lapsed)."""
+        if time.time() >= self.valid_until:
+            return []
+        return [p for p in universe if slot_for(p, self.slots) in self.owned]
+
+    def claim_alert(self, pair, band, candle_time, now=None):
+        """
+        True if this node should send the alert for (pair, band, candle): nobody
+        sent it and no instance alerted that pair+band within the cooldown.
+        """
+        now = time.time() if now is None else now
+
+        def claim(db):
+            last = db.execute("SELECT candle_time, at FROM alerts WHERE pair = ? AND band = ? ORDER BY at DESC LIMIT 1",
+                              (pair, band)).fetchone()
+            if last is not None and (last[0] == candle_time or now - last[1] < self.cooldown_sec):
+                return False
+            cur = db.execute("INSERT OR IGNORE INTO alerts (pair, band, candle_time, node_id, at) VALUES (?, ?, ?, ?, ?)",
+                             (pair, band, candle_time, self.node_id, now))
+            return cur.rowcount == 1
+
+        try:
+            return self._transaction(claim)
+        except sqlite3.Error as e:
+            # Better a duplicate than a missed breakout
+            print(f"⚠️ Coordinator unavailable, sending {pair} {band} unclaimed: {e}", flush=True)
+            return True
+
+    def attach(self, engine, universe, spawn=None):
+        """
+        Drive a ScannerEngine: scan only the leased pairs of universe(), claim
+        alerts through the database, and keep heartbeating in the background.
+        """
+        from .alerting import alert_coalescer
+
+        self.heartbeat()
+        engine.pairs = self.pairs_for(universe())
+        alert_coalescer.claim = self.claim_alert
+        print(f"[Coordinator] node {self.node_id}: {len(self.owned)}/{self.slots} slots, "
+              f"{len(engine.pairs)} pairs", flush=True)
+
+        def loop():
+            while not self._stop.wait(self.heartbeat_sec):
+                before = self.owned
+                try:
+                    self.heartbeat()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Coordinator heartbeat failed: {e}", flush=True)
+                engine.pairs = self.pairs_for(universe())
+                if self.owned != before:
+                    print(f"[Coordinator] node {self.node_id}: {len(self.owned)}/{self.slots} slots, "
+                          f"{len(engine.pairs)} pairs", flush=True)
+
+        if spawn is not None:
+            self._thread = spawn(loop)
+        else:
+            self._thread = threading.Thread(target=loop, name="coordinator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.release()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not release leases: {e}", flush=True)
+
+
+def run_coordinated_scanner(path):
+    """CLI entry point: REST-scan this node's share of the pairs until interrupted."""
+    from .scanner import ScannerEngine, all_pairs
+
+    engine = ScannerEngine(pairs=[])
+    coordinator = Coordinator(path).attach(engine, all_pairs)
+    try:
+        engine.run()
+    finally:
+        coordinator.stop()
@@ -0,0 +1,141 @@
+# === Resonance.ai v12.5 Breakout Analytics ===
+# Δ (percent_change): % price change from first to last candle
+# W (band_width): volatility range = (high - low) / end_price * 100
+# High Δ = trending strongly (potential breakout)
+# High W = volatile (good for faster scalping)
+from dataclasses import dataclass
+from math import fsum
+
+from . import settings
+from .bands import evaluate_pair
+from .candle_store import CandleWindow
+
+
+def log_coin_scan(symbol, change_1h=None, band_width=None, breakout_status=None):
+    msg = f"[SKIPPED] {symbol} | "
+    if change_1h is not None:
+        msg += f"1H Δ: {change_1h:.3f}% | "
+    if band_width is not None:
+        msg += f"Band W: {band_width:.3f}% | "
+    if breakout_status is not None:
+        msg += f"Breakout: {'✔' if breakout_status else '✘'}"
+    print(msg, flush=True)
+
+
+def sweep_stats(candles):
+    """(end_price, percent_change, band_width) over a whole CandleWindow."""
+    closes = candles.close
+    start_price = closes[0]
+    end_price = closes[-1]
+    percent_change = ((end_price - start_price) / start_price) * 100
+    band_width = (max(candles.high) - min(candles.low)) / end_price * 100
+    return end_price, percent_change, band_width
+
+
+def is_breakout_band(cset, breakout_threshold, volume_spike_ratio):
+    """
+    Returns (hit: bool, info: dict)
+    cset is a CandleWindow (zero-copy columns) or a list of [time, low, high, open, close, volume] rows.
+    info includes: window, last_close, max_high, pct_over, last_vol, avg_vol, vol_ratio, usd_per_min
+    """
+    if len(cset) < 3:
+        return False, None
+
+    if isinstance(cset, CandleWindow):
+        highs, closes, volumes = cset.high, cset.close, cset.volume
+    else:
+        highs   = [c[2] for c in cset]
+        closes  = [c[4] for c in cset]
+        volumes = [c[5] for c in cset]
+
+    max_high    = max(highs[:-1])           # highest high before last candle
+    last_close  = closes[-1]                # last close
+    avg_vol     = fsum(volumes[:-1]) / (len(cset) - 1)
+    last_vol    = volumes[-1]
+    usd_per_min = last_vol * last_close
+
+    pct_over    = ((last_close / max_high) - 1.0) * 100 if max_high > 0 else 0.0
+    vol_ratio   = (last_vol / avg_vol) if avg_vol > 0 else 0.0
+
+    hit = (
+        last_close > max_high * (1 + breakout_threshold) and
+        last_vol   > avg_vol   * volume_spike_ratio and
+        usd_per_min >= settings.ABSOLUTE_DOLLAR_VOLUME_MIN
+    )
+
+    info = {
+        "window": len(cset),
+        "last_close": float(last_close),
+        "max_high": float(max_high),
+        "pct_over": float(pct_over),
+        "last_vol": float(last_vol),
+        "avg_vol": float(avg_vol),
+        "vol_ratio": float(vol_ratio),
+        "usd_per_min": float(usd_per_min),
+    }
+    return hit, info
+
+
+@dataclass
+class BandStats:
+    over_max_pct: float
+    vol: float
+    avg_vol: float
+    vol_mult: float
+    dollars_per_min: float
+    window: int
+
+def stats_from_info(info: dict) -> "BandStats":
+    """Convert legacy info dict to BandStats to avoid shared-state bugs and make formatting explicit."""
+    if not info:
+        return None
+    return BandStats(
+        over_max_pct=float(info.get("pct_over", 0.0)),
+        vol=float(info.get("last_vol", 0.0)),
+        avg_vol=float(info.get("avg_vol", 0.0)),
+        vol_mult=float(info.get("vol_ratio", 0.0)),
+        dollars_per_min=float(info.get("usd_per_min", 0.0)),
+        window=int(info.get("window", 0)),
+    )
+
+
+# Each condition's progress counts up to this much towards readiness
+READINESS_CAP = 1.5
+
+def band_readiness(pct_over, vol_ratio, breakout_threshold, volume_spike_ratio):
+    """
+    How close a band is to firing: the weaker of price progress (pct_over over
+    the threshold, in %) and volume progress (vol_ratio over the spike ratio).
+    1.0 means both conditions are just met; 0 or less, far from it.
+    """
+    price = pct_over / (breakout_threshold * 100)
+    volume = vol_ratio / volume_spike_ratio
+    return min(price, volume, READINESS_CAP)
+
+
+def assess_bands(candles, bands=None):
+    """
+    Evaluate a CandleWindow against every band of the registry (settings.BANDS)
+    with the shared band engine (bands.evaluate_pair). A band is only evaluated
+    once the window holds all of its candles.
+    Returns (band_details for the bands that hit, readiness of the closest band
+    or None if no band has enough candles).
+    """
+    band_details = []
+    readiness = None
+    results = evaluate_pair(
+        candles, settings.BANDS if bands is None else bands,
+        settings.CANDLE_INTERVAL, settings.ABSOLUTE_DOLLAR_VOLUME_MIN,
+    )
+    for band, hit, info in results:
+        if hit:
+            band_details.append({"name": band.name, "stats": stats_from_info(info)})
+        if info is not None:
+            r = band_readiness(info["pct_over"], info["vol_ratio"], band.threshold, band.ratio)
+            readiness = r if readiness is None else max(readiness, r)
+    return band_details, readiness
+
+
+def detect_bands(candles, bands=None):
+    """The band_details list for the bands that hit (see assess_bands)."""
+    return assess_bands(candles, bands)[0]
@@ -0,0 +1,39 @@
+# In-process event bus.
+# The scan engine publishes what it sees (scan results, breakout alerts) as plain
+# dicts; consumers such as the WebUI server subscribe handlers that are called
+# synchronously on the publishing thread. With no subscribers, publishing costs a
+# dict lookup, so the headless scanner pays nothing for it.
+import threading
+
+SCAN_RESULT = "scan_result"
+BREAKOUT_ALERT = "breakout_alert"
+SWEEP_DONE = "sweep_done"            # a REST sweep finished: {"pairs": n, "sweep_sec": duration}
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers = {}          # topic -> tuple of handlers (replaced, never mutated)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, handler):
+        with self._lock:
+            self._handlers[topic] = self._handlers.get(topic, ()) + (handler,)
+
+    def unsubscribe(self, topic, handler):
+        with self._lock:
+            self._handlers[topic] = tuple(h for h in self._handlers.get(topic, ()) if h is not handler)
+
+    def has_subscribers(self, topic):
+        return bool(self._handlers.get(topic))
+
+    def publish(self, topic, payload):
+        """Call every handler for `topic`; a failing handler never breaks the publisher."""
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"❌ Event handler error ({topic}): {e}", flush=True)
+
+
+# Shared bus the scan engine publishes to
+bus = EventBus()
@@ -0,0 +1,105 @@
+# Shared HTTP client layer for the scanner, the WebUI backend and the USD curator.
+# Every outbound call goes through a pooled requests.Session, so connections to
+# api.exchange.coinbase.com (and the webhook hosts) are kept alive between calls
+# instead of paying a TCP+TLS handshake per request. Requests to known hosts are
+# also paced by the shared token-bucket limiter in rate_limiter.py.
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .rate_limiter import get_limiter
+
+# Number of per-host connection pools kept alive (one per distinct host we talk to).
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+# Keep-alive connections per host. Keep this >= FETCH_CONCURRENCY.
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+# Retries for idempotent requests (GET/HEAD) on connection errors and 5xx statuses.
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+# Exponential backoff factor between retries: backoff * 2**(n-1) seconds.
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.3"))
+
+# 429s are left to RateLimitedAdapter so the limiter sees them and slows every caller down
+RETRY_STATUSES = (500, 502, 503, 504)
+DEFAULT_USER_AGENT = "resonance-scanner/12.5"
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a limiter token before each send and retries 429s with backoff."""
+
+    def __init__(self, limiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        endpoint = self.limiter.classify(request.url)
+        if endpoint is None:
+            return super().send(request, **kwargs)
+
+        attempt = 0
+        while True:
+            self.limiter.acquire(endpoint)
+            response = super().send(request, **kwargs)
+            if response.status_code != 429:
+                self.limiter.on_success(endpoint)
+                return response
+            if attempt >= self.limiter.max_retries:
+                return response
+            self.limiter.on_throttled(endpoint, response.headers.get("Retry-After"), attempt)
+            response.close()
+            attempt += 1
+
+
+def build_session(
+    user_agent=DEFAULT_USER_AGENT,
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    retries=HTTP_RETRIES,
+    backoff=HTTP_BACKOFF,
+    limiter=None,
+):
+    """
+    Build a requests.Session with per-host keep-alive pools and a retry policy.
+    POSTs (webhooks) are never retried on 5xx here, so an alert is not sent twice;
+    a 429 is safe to retry since the request was rejected unprocessed.
+    Requests are paced by `limiter`, defaulting to the process-wide shared one.
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Retry-After on 429 is honoured by RateLimitedAdapter, not by urllib3
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = RateLimitedAdapter(
+        limiter if limiter is not None else get_limiter(),
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": user_agent})
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
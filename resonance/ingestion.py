@@ -0,0 +1,116 @@
+# REST candle ingestion: delta fetches into the shared candle cache, fanned out
+# over a bounded thread pool. Closed candles are also persisted to the on-disk
+# archive, which warm_start() reads back after a restart.
+import time
+from datetime import timedelta, datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import settings
+from .candle_archive import get_archive
+from .candle_cache import CandleCache
+from .http_session import get_session
+
+# Most recent candles per (product_id, granularity); each cycle only fetches the delta
+candle_cache = CandleCache(maxlen=settings.history_periods())
+
+def get_candles(product_id, granularity=settings.CANDLE_INTERVAL):
+    try:
+        end = datetime.now(timezone.utc)
+        window_start = end - timedelta(seconds=granularity * settings.history_periods())
+
+        # Delta fetch: resume from the newest cached candle (re-fetching it, since it
+        # may still have been forming). Fall back to the full window on a cold or stale cache.
+        last_cached = candle_cache.last_time(product_id, granularity)
+        if last_cached is not None and last_cached >= window_start.timestamp():
+            start = datetime.fromtimestamp(last_cached, tz=timezone.utc)
+        else:
+            start = window_start
+
+        url = f"{settings.BASE_URL}/products/{product_id}/candles"
+        params = {
+            "granularity": granularity,
+            "start": start.isoformat().replace("+00:00", "Z"),
+            "end": end.isoformat().replace("+00:00", "Z"),
+        }
+
+        response = get_session().get(url, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ Error fetching candles for {product_id}: HTTP {response.status_code}", flush=True)
+            return []
+
+        data = response.json()
+        if not isinstance(data, list) or (not data and last_cached is None):
+            print(f"⚠️ API returned no/bad data for {product_id}: {data}", flush=True)
+            return []
+
+        candle_cache.update(product_id, granularity, data)
+        archive_candles(product_id, granularity, data, now=end.timestamp())
+        # The newest lookback_candles candles, none older than the slack-padded window
+        return candle_cache.window(product_id, granularity, start_time=window_start.timestamp(),
+                                   n=settings.lookback_candles)
+    except Exception as e:
+        print(f"❌ Exception fetching candles for {product_id}: {e}", flush=True)
+        return []
+
+
+def archive_candles(product_id, granularity, candles, now=None):
+    """Persist the closed candles among `candles` (the still-forming one is left for a later call)."""
+    archive = get_archive()
+    if archive is None:
+        return
+    now = time.time() if now is None else now
+    try:
+        archive.append(product_id, granularity, [c for c in candles if c[0] + granularity <= now])
+    except OSError as e:
+        print(f"⚠️ Could not archive candles for {product_id}: {e}", flush=True)
+
+
+def warm_start(pairs, granularity=settings.CANDLE_INTERVAL):
+    """
+    Fill the candle cache from the on-disk archive. Returns the pairs whose stored
+    history reaches the previous candle, i.e. that need no REST backfill.
+    """
+    archive = get_archive()
+    if archive is None:
+        return []
+    now = time.time()
+    start = now - granularity * settings.history_periods()
+    fresh = []
+    for pair in pairs:
+        try:
+            rows = archive.read(pair, granularity, start=start)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read archived candles for {pair}: {e}", flush=True)
+            continue
+        if len(rows):
+            candle_cache.update(pair, granularity, rows.tolist())
+            if rows[-1][0] + 2 * granularity > now:
+                fresh.append(pair)
+    return fresh
+
+
+# === Concurrent fetch engine === #
+_fetch_pool = None
+
+def _get_fetch_pool():
+    global _fetch_pool
+    if _fetch_pool is None:
+        _fetch_pool = ThreadPoolExecutor(max_workers=settings.FETCH_CONCURRENCY, thread_name_prefix="fetch")
+    return _fetch_pool
+
+def fetch_candles_concurrent(pairs, granularity=settings.CANDLE_INTERVAL):
+    """
+    Fetch candles for every pair on a bounded thread pool.
+    Yields (pair, candles) as each request completes, so evaluation starts
+    before the slowest pair has returned.
+    """
+    pool = _get_fetch_pool()
+    futures = {pool.submit(get_candles, pair, granularity): pair for pair in pairs}
+    for fut in as_completed(futures):
+        pair = futures[fut]
+        try:
+            candles = fut.result()
+        except Exception as e:
+            print(f"❌ Exception fetching candles for {pair}: {e}", flush=True)
+            candles = []
+        yield pair, candles
@@ -0,0 +1,126 @@
+# Scanner statistics for the WebUI, fed by the engine's event bus.
+# Every update is O(1): rolling rates live in fixed per-second buckets, and the
+# latest Δ per symbol sits in a dict. The top-K gainers/losers are picked with a
+# bounded heap when a snapshot is built (every few seconds), and /api/stats
+# serves that precomputed snapshot instead of recomputing per request.
+import heapq
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+STATS_WINDOW_SEC = int(os.getenv("STATS_WINDOW_SEC", "60"))    # rolling window for rates and averages
+STATS_TOP_K = int(os.getenv("STATS_TOP_K", "5"))
+
+
+class RollingCounter:
+    """Sum and count of values over the last `window` seconds, in one-second buckets."""
+
+    def __init__(self, window=STATS_WINDOW_SEC):
+        self.window = window
+        self._sums = [0.0] * window
+        self._counts = [0] * window
+        self._second = None
+        self._first = None
+        self.sum = 0.0
+        self.count = 0
+
+    def _advance(self, now):
+        second = int(now)
+        if self._second is None:
+            self._second = self._first = second
+            return
+        steps = min(second - self._second, self.window)
+        for i in range(1, steps + 1):
+            slot = (self._second + i) % self.window
+            self.sum -= self._sums[slot]
+            self.count -= self._counts[slot]
+            self._sums[slot] = 0.0
+            self._counts[slot] = 0
+        if second > self._second:
+            self._second = second
+
+    def add(self, value=1.0, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        slot = self._second % self.window
+        self._sums[slot] += value
+        self._counts[slot] += 1
+        self.sum += value
+        self.count += 1
+
+    def rate(self, now=None):
+        """Events per second over the window (or since the first event, if that is shorter)."""
+        self._advance(time.monotonic() if now is None else now)
+        if self._first is None:
+            return 0.0
+        return self.count / min(self.window, self._second - self._first + 1)
+
+    def mean(self, now=None):
+        self._advance(time.monotonic() if now is None else now)
+        return self.sum / self.count if self.count else 0.0
+
+
+class StatsAggregator:
+    def __init__(self, window=STATS_WINDOW_SEC, top_k=STATS_TOP_K):
+        self.top_k = top_k
+        self.start_time = datetime.now(timezone.utc)
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_scanned = 0
+        self.total_alerts = 0
+        self.breakouts_today = 0
+        self._today = self.start_time.date()
+        self.alerts_by_band = {}
+        self._scans = RollingCounter(window)
+        self._alerts = RollingCounter(window)
+        self._volume = RollingCounter(window)     # usd_per_min of each scanned pair
+        self._change = {}                         # symbol -> latest percent_change
+        self._snapshot = None
+
+    def on_scan_result(self, data):
+        with self._lock:
+            self.total_scanned += 1
+            self._scans.add()
+            if data.get('usd_per_min') is not None:
+                self._volume.add(data['usd_per_min'])
+            self._change[data['symbol']] = data['change']
+
+    def on_breakout_alert(self, data):
+        with self._lock:
+            today = datetime.now(timezone.utc).date()
+            if today != self._today:
+                self._today, self.breakouts_today = today, 0
+            self.total_alerts += 1
+            self.breakouts_today += 1
+            self._alerts.add()
+            for band in data.get('bands', ()):
+                self.alerts_by_band[band] = self.alerts_by_band.get(band, 0) + 1
+
+    def refresh(self):
+        """Build a new snapshot (called periodically, not per request) and return it."""
+        with self._lock:
+            changes = list(self._change.items())
+            gainers = heapq.nlargest(self.top_k, changes, key=lambda kv: kv[1])
+            losers = heapq.nsmallest(self.top_k, changes, key=lambda kv: kv[1])
+            uptime = int(time.monotonic() - self._started)
+            top = gainers[0] if gainers else None
+            snapshot = {
+                'total_scanned': self.total_scanned,
+                'total_alerts': self.total_alerts,
+                'breakouts_today': self.breakouts_today,
+                'alerts_by_band': dict(self.alerts_by_band),
+                'start_time': self.start_time.isoformat(),
+                'uptime': f"{uptime // 3600}:{uptime // 60 % 60:02d}:{uptime % 60:02d}",
+                'scan_rate': round(self._scans.rate(), 2),
+                'alert_rate': round(self._alerts.rate(), 4),
+                'avg_volume': round(self._volume.mean(), 2),
+                'top_gainer': f"{top[0]} {top[1]:+.2f}%" if top else '--',
+                'top_gainers': [{'symbol': s, 'change': round(c, 4)} for s, c in gainers],
+                'top_losers': [{'symbol': s, 'change': round(c, 4)} for s, c in losers],
+            }
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self):
+        """The latest precomputed snapshot (built on first use)."""
+        return self._snapshot if self._snapshot is not None else self.refresh()
@@ -0,0 +1,223 @@
+# Parameter sweep for the breakout bands.
+# Evaluates a grid (or random samples) of band thresholds, volume ratios, window
+# lengths and the dollar-volume floor with the backtest in backtest.py, one
+# combination per task on a ProcessPoolExecutor, and ranks the results by hit
+# rate and expectancy. The candle columns are loaded once into shared memory;
+# workers map the same pages instead of receiving a pickled copy per task.
+# Parameter names are the ScannerSettings / /api/settings ones, so a winning row
+# can be applied from the WebUI.
+#
+#   python -m resonance.optimize --samples 300
+#   python -m resonance.optimize --grid --axis fast_threshold=0.01,0.013,0.016 --axis fast_ratio=1.3,1.6
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import settings
+from .backtest import BandIndex, History, evaluate_band, load_params, run_backtest
+from .candle_archive import CandleArchive, CANDLE_STORE_DIR
+
+OPTIMIZE_CSV = os.getenv("OPTIMIZE_CSV", "optimize_results.csv")
+OPTIMIZE_MIN_TRADES = int(os.getenv("OPTIMIZE_MIN_TRADES", "20"))   # combos with fewer trades are not ranked
+
+def default_axes():
+    """Values tried per parameter: a spread around the current settings, for every band."""
+    axes = {}
+    for band in settings.BANDS:
+        key = band.name.lower()
+        axes[f"{key}_window"] = [band.window]
+        axes[f"{key}_threshold"] = [round(band.threshold * m, 5) for m in (0.5, 0.75, 1.0, 1.25, 1.5)]
+        axes[f"{key}_ratio"] = [round(band.ratio * m, 3) for m in (0.75, 1.0, 1.25, 1.5)]
+    axes["volume_floor"] = sorted({500.0, 1000.0, settings.ABSOLUTE_DOLLAR_VOLUME_MIN, 5000.0, 10000.0})
+    return axes
+
+
+def parse_axis(spec):
+    """'fast_ratio=1.3,1.6' -> ('fast_ratio', [1.3, 1.6])"""
+    name, _, values = spec.partition("=")
+    cast = int if name.endswith("_window") else float
+    return name.strip(), [cast(v) for v in values.split(",") if v.strip()]
+
+
+def combinations(axes, samples=None, seed=0):
+    """Full grid, or `samples` distinct random draws from it."""
+    names = list(axes)
+    size = 1
+    for name in names:
+        size *= len(axes[name])
+    if samples is None or samples >= size:
+        return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < samples:
+        seen.add(tuple(rng.choice(axes[n]) for n in names))
+    return [dict(zip(names, values)) for values in sorted(seen)]
+
+
+def bands_for(combo):
+    return [
+        replace(
+            band,
+            window=combo[f"{key}_window"],
+            threshold=combo[f"{key}_threshold"],
+            ratio=combo[f"{key}_ratio"],
+        )
+        for band, key in ((b, b.name.lower()) for b in settings.BANDS)
+    ]
+
+
+# === Shared candle columns === #
+
+def share_history(h):
+    """Copy the candle columns into a shared memory block. Returns (block, descriptor for workers)."""
+    block = shared_memory.SharedMemory(create=True, size=max(h.columns.nbytes, 1))
+    np.ndarray(h.columns.shape, dtype=h.columns.dtype, buffer=block.buf)[:] = h.columns
+    return block, (block.name, h.columns.shape, h.pairs, h.lengths.tolist())
+
+
+# Per-worker state, set up once by _init_worker
+_worker = {}
+
+def _init_worker(descriptor, params, lookback):
+    name, shape, pairs, lengths = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    columns = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    h = History(pairs, columns, lengths)
+    _worker.update(block=block, history=h, params=params, lookback=lookback, hits={},
+                   index=BandIndex(h, params["granularity"]))
+
+
+def _evaluate_combo(combo):
+    h, params = _worker["history"], _worker["params"]
+    cache, index, floor = _worker["hits"], _worker["index"], combo["volume_floor"]
+    bands = bands_for(combo)
+    # Like the live scanner, fetch as much history as the longest band needs plus slack
+    lookback = _worker["lookback"] or settings.history_periods(bands)
+
+    def evaluate(window, thr, ratio, band_floor):
+        # Raw band hits only depend on these values; random draws repeat them often
+        key = (window, thr, ratio, band_floor, lookback)
+        if key not in cache:
+            if len(cache) >= 64:
+                cache.pop(next(iter(cache)))
+            cache[key] = evaluate_band(h, window, lookback, params["granularity"], thr, ratio, band_floor,
+                                       index=index)[0]
+        return cache[key]
+
+    summary = run_backtest(h, params, bands=bands, lookback=lookback,
+                           abs_dollar_volume_min=floor, evaluate=evaluate)[3]
+    return combo, summary
+
+
+def sweep(h, combos, params, lookback=None, workers=None, progress=None):
+    """Backtest every combination in parallel. Returns [(combo, summary rows)] in completion order."""
+    block, descriptor = share_history(h)
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(descriptor, params, lookback)) as pool:
+            futures = [pool.submit(_evaluate_combo, combo) for combo in combos]
+            for n, fut in enumerate(as_completed(futures), 1):
+                results.append(fut.result())
+                if progress:
+                    progress(n, len(futures))
+    finally:
+        block.close()
+        block.unlink()
+    return results
+
+
+def rank(results, key, min_trades=OPTIMIZE_MIN_TRADES):
+    """Flattened rows (parameters + overall metrics + alerts per band), best `key` first."""
+    rows = []
+    for combo, summary in results:
+        overall = summary[0]
+        if overall["trades"] < min_trades:
+            continue
+        row = dict(combo)
+        row.update({k: v for k, v in overall.items() if k != "group"})
+        row.update({f"{s['group'].lower()}_alerts": s["alerts"] for s in summary[1:]})
+        rows.append(row)
+    return sorted(rows, key=lambda r: (r[key], r["trades"]), reverse=True)
+
+
+def print_table(title, rows, top):
+    print(f"\n{title}")
+    for r in rows[:top]:
+        params = " ".join(f"{k}={r[k]}" for k in r if k.endswith(("_threshold", "_ratio", "_window", "_floor")))
+        print(f"  hit {r['hit_rate']:.1%} | exp {r['expectancy_pct']:+.3f}% | trades {r['trades']:>5} | {params}")
+
+
+def main(argv=None):
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    params = load_params()
+
+    ap = argparse.ArgumentParser(prog="resonance.optimize", description="Sweep band parameters over archived candles")
+    ap.add_argument("--hours", type=int, default=params["lookback_hours"], help="History to replay (default: LOOKBACK_HOURS)")
+    ap.add_argument("--archive", default=CANDLE_STORE_DIR or "data/candles", help="Candle archive directory")
+    ap.add_argument("--pairs", nargs="*", help="Pairs to test (default: every pair in the archive)")
+    ap.add_argument("--axis", action="append", default=[], metavar="NAME=V1,V2",
+                    help="Values for one parameter, e.g. fast_threshold=0.01,0.013 (repeatable)")
+    ap.add_argument("--grid", action="store_true", help="Try every combination instead of random samples")
+    ap.add_argument("--samples", type=int, default=200, help="Random combinations to try (default 200)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--lookback", type=int, default=None,
+                    help="Candle periods visible to each band (default: the combination's longest window + HISTORY_SLACK_CANDLES)")
+    ap.add_argument("--min-trades", type=int, default=OPTIMIZE_MIN_TRADES)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    axes = default_axes()
+    for spec in args.axis:
+        name, values = parse_axis(spec)
+        if name not in axes:
+            ap.error(f"unknown parameter {name!r}; choose from {', '.join(axes)}")
+        axes[name] = values
+    combos = combinations(axes, None if args.grid else args.samples, args.seed)
+
+    g = params["granularity"]
+    archive = CandleArchive(args.archive)
+    end = (time.time() // g) * g
+    pairs = args.pairs or archive.symbols(g)
+    h = History.from_archive(archive, pairs, g, end - args.hours * 3600, end)
+    if not len(h):
+        print(f"No archived candles in {args.archive} for the last {args.hours}h (try python -m resonance.backtest --backfill)")
+        return
+
+    print(f"Sweeping {len(combos)} combinations over {len(h):,} candles for {len(h.pairs)} pairs", flush=True)
+    t0 = time.monotonic()
+    step = max(1, len(combos) // 20)
+    results = sweep(h, combos, params, lookback=args.lookback, workers=args.workers,
+                    progress=lambda n, total: n % step == 0 and print(f"  {n}/{total}", flush=True))
+    print(f"Done in {time.monotonic() - t0:.1f}s")
+
+    by_expectancy = rank(results, "expectancy_pct", args.min_trades)
+    by_hit_rate = rank(results, "hit_rate", args.min_trades)
+    if not by_expectancy:
+        print(f"No combination produced {args.min_trades}+ trades")
+        return
+    print_table("Best expectancy", by_expectancy, args.top)
+    print_table("Best hit rate", by_hit_rate, args.top)
+
+    with open(OPTIMIZE_CSV, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=list(by_expectancy[0]))
+        w.writeheader()
+        w.writerows(by_expectancy)
+    print(f"\nWrote {len(by_expectancy)} ranked combinations to {OPTIMIZE_CSV}")
+
+
+if __name__ == "__main__":
+    main()
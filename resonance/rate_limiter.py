@@ -0,0 +1,141 @@
+# Shared rate limiting for outbound HTTP.
+# One token bucket per endpoint class (exchange public REST, Discord, Telegram),
+# with 429 / Retry-After handling and jittered exponential backoff. The bucket
+# rate adapts: it halves on every 429 and creeps back to the configured ceiling
+# on success, so concurrent fetchers settle at the maximum sustainable rate.
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Coinbase Exchange public endpoints: 10 req/s per IP, bursts up to 15.
+RATE_LIMIT_PUBLIC_RPS = float(os.getenv("RATE_LIMIT_PUBLIC_RPS", "10"))
+RATE_LIMIT_PUBLIC_BURST = int(os.getenv("RATE_LIMIT_PUBLIC_BURST", "15"))
+# Max times one request is retried after a 429 before the response is returned as-is.
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+BACKOFF_BASE_SEC = 0.5
+BACKOFF_CAP_SEC = 30.0
+
+# host -> endpoint class
+ENDPOINT_CLASSES = {
+    "api.exchange.coinbase.com": "public",
+    "discord.com": "discord",
+    "discordapp.com": "discord",
+    "api.telegram.org": "telegram",
+}
+
+# endpoint class -> (requests per second, burst)
+DEFAULT_LIMITS = {
+    "public": (RATE_LIMIT_PUBLIC_RPS, RATE_LIMIT_PUBLIC_BURST),
+    "discord": (2.5, 5),     # webhooks: 5 requests / 2s
+    "telegram": (1.0, 3),    # ~1 message/s per chat
+}
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.max_rate = float(rate)
+        self.min_rate = self.max_rate / 20
+        self.rate = self.max_rate
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a token is available (and any backoff pause has elapsed)."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                else:
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every caller of this bucket for `seconds` and halve the rate."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+
+    def recover(self):
+        """Additive increase back towards the configured rate after a success."""
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+
+def parse_retry_after(value):
+    """Retry-After header (delta-seconds or HTTP date) -> seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SEC, cap=BACKOFF_CAP_SEC):
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RateLimiter:
+    def __init__(self, limits=None, endpoint_classes=None, max_retries=RATE_LIMIT_MAX_RETRIES):
+        limits = DEFAULT_LIMITS if limits is None else limits
+        self.endpoint_classes = ENDPOINT_CLASSES if endpoint_classes is None else endpoint_classes
+        self.buckets = {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+        self.max_retries = max_retries
+        self.throttled = {name: 0 for name in self.buckets}
+
+    def classify(self, url):
+        """Endpoint class for a URL, or None if it is not rate limited."""
+        name = self.endpoint_classes.get(urlsplit(url).hostname or "")
+        return name if name in self.buckets else None
+
+    def acquire(self, endpoint):
+        self.buckets[endpoint].acquire()
+
+    def on_success(self, endpoint):
+        self.buckets[endpoint].recover()
+
+    def on_throttled(self, endpoint, retry_after, attempt):
+        """Record a 429 and pause the whole endpoint class; returns the delay applied."""
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = backoff_delay(attempt)
+        self.throttled[endpoint] += 1
+        self.buckets[endpoint].pause(delay)
+        print(f"⏳ Rate limited on {endpoint} (attempt {attempt + 1}), backing off {delay:.2f}s", flush=True)
+        return delay
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_limiter():
+    """Return the process-wide shared rate limiter, creating it on first use."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
@@ -0,0 +1,85 @@
+# Batched scan updates for the WebUI.
+# Instead of one scan_update event per symbol per sweep, results are collected
+# (latest value per symbol wins) and flushed as one columnar frame:
+#   {"type": "scan_batch", "symbols": [...], "change": [...], "band_width": [...], "timestamp": ...}
+# Frames are flushed at the end of a sweep or every WEBUI_BATCH_SEC, never more
+# often than WEBUI_MAX_FPS, and can skip symbols whose Δ/W moved less than
+# WEBUI_DELTA_EPS (percentage points) since they were last sent.
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+WEBUI_BATCH = os.getenv("WEBUI_BATCH", "1") == "1"             # 0 = one scan_update per symbol (legacy)
+WEBUI_BATCH_SEC = float(os.getenv("WEBUI_BATCH_SEC", "1.0"))   # time slice for timed flushes (stream mode)
+WEBUI_MAX_FPS = float(os.getenv("WEBUI_MAX_FPS", "2"))         # max scan_update frames per second
+WEBUI_DELTA_EPS = float(os.getenv("WEBUI_DELTA_EPS", "0"))     # 0 = send every symbol every frame
+
+
+class ScanBatcher:
+    def __init__(self, max_fps=WEBUI_MAX_FPS, delta_eps=WEBUI_DELTA_EPS):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.delta_eps = delta_eps
+        self._pending = {}       # symbol -> (change, band_width), insertion ordered
+        self._sent = {}          # symbol -> (change, band_width) last sent
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.skipped = 0         # symbols left out by the delta filter
+
+    def add(self, symbol, change, band_width):
+        with self._lock:
+            self._pending.pop(symbol, None)   # re-insert so the newest result sorts last
+            self._pending[symbol] = (change, band_width)
+
+    def flush(self, now=None):
+        """
+        Build one columnar frame from everything pending, or return None when
+        there is nothing new or the frame-rate limit has not elapsed yet (the
+        pending results are then kept for the next flush).
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self._pending or now - self._last_flush < self.min_interval:
+                return None
+            pending, self._pending = self._pending, {}
+            self._last_flush = now
+
+            eps = self.delta_eps
+            symbols, changes, widths = [], [], []
+            for symbol, (change, width) in pending.items():
+                if eps > 0:
+                    prev = self._sent.get(symbol)
+                    if prev is not None and abs(change - prev[0]) < eps and abs(width - prev[1]) < eps:
+                        self.skipped += 1
+                        continue
+                    self._sent[symbol] = (change, width)
+                symbols.append(symbol)
+                changes.append(round(change, 4))
+                widths.append(round(width, 4))
+
+        if not symbols:
+            return None
+        self.frames += 1
+        return {
+            'type': 'scan_batch',
+            'symbols': symbols,
+            'change': changes,
+            'band_width': widths,
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        }
+
+
+def merge_frames(older, newer):
+    """Fold an unsent frame into the next one (newer values win), so coalescing never loses a symbol."""
+    merged = dict(zip(older['symbols'], zip(older['change'], older['band_width'])))
+    for symbol, change, width in zip(newer['symbols'], newer['change'], newer['band_width']):
+        merged.pop(symbol, None)
+        merged[symbol] = (change, width)
+    return {
+        'type': 'scan_batch',
+        'symbols': list(merged),
+        'change': [v[0] for v in merged.values()],
+        'band_width': [v[1] for v in merged.values()],
+        'timestamp': newer['timestamp']
+    }
@@ -0,0 +1,338 @@
+# Scan engine: evaluates swept or streamed candles against the bands and hands
+# hits to the alert coalescer. Nothing runs at import; call run_rest_scanner()
+# or run_stream_scanner() (or scan_sweep() for a single pass). Results are also
+# published on the event bus for in-process consumers such as the WebUI.
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from . import settings
+from .alert_coalescer import ALERT_DIGEST_SEC
+from .alerting import alert_coalescer, flush_alerts, get_dispatcher
+from .detection import assess_bands, log_coin_scan, stats_from_info, sweep_stats
+from .events import BREAKOUT_ALERT, SCAN_RESULT, SWEEP_DONE, bus
+from .ingestion import archive_candles, candle_cache, fetch_candles_concurrent, warm_start
+from .scheduler import PRIORITY_SCHEDULING, PriorityScheduler
+from .universe import all_pairs, universe
+
+
+def scan_pair(pair, candles):
+    """
+    Evaluate one pair's CandleWindow against every configured band and send alerts on a hit.
+    All bands share one pass over the ring-buffer columns (see bands.BandFrame).
+    """
+    if not candles:
+        log_coin_scan(pair)
+        return
+
+    end_price, percent_change, band_width = sweep_stats(candles)
+    band_details, readiness = assess_bands(candles)
+    report_pair(
+        pair, end_price, percent_change, band_width, band_details, candles.time[-1],
+        usd_per_min=candles.volume[-1] * end_price, readiness=readiness,
+    )
+
+
+def report_pair(pair, end_price, percent_change, band_width, band_details, candle_time, usd_per_min=None,
+                readiness=None):
+    """Log one evaluated pair and queue an alert for any band hit not already alerted."""
+    if bus.has_subscribers(SCAN_RESULT):
+        bus.publish(SCAN_RESULT, {
+            'type': 'scan_result',
+            'symbol': pair,
+            'change': float(percent_change),
+            'band_width': float(band_width),
+            'usd_per_min': None if usd_per_min is None else float(usd_per_min),
+            'readiness': None if readiness is None else float(readiness),
+            'timestamp': datetime.now(timezone.utc).isoformat()
+        })
+
+    if band_details:
+        print(
+            f"[SELECTED] {pair} | Δ: {percent_change:.2f}% | W: {band_width:.2f}% | "
+            f"Hits: {[bd['name'] for bd in band_details]}",
+            flush=True
+        )
+        fresh = alert_coalescer.filter(pair, band_details, candle_time)
+        if not fresh:
+            print(f"[COOLDOWN] {pair} | already alerted for these bands", flush=True)
+            return
+        # Held until the next flush so simultaneous breakouts share one digest
+        alert_coalescer.add({
+            "pair": pair,
+            "price": end_price,
+            "percent_change": percent_change,
+            "band_width": band_width,
+            "band_details": fresh,
+        })
+        if bus.has_subscribers(BREAKOUT_ALERT):
+            bus.publish(BREAKOUT_ALERT, {
+                'type': 'breakout_alert',
+                'symbol': pair,
+                'price': float(end_price),
+                'change': float(percent_change),
+                'band_width': float(band_width),
+                'bands': [bd["name"] for bd in fresh],
+                'timestamp': datetime.now(timezone.utc).isoformat()
+            })
+    else:
+        print(f"{pair} | Δ: {percent_change:.2f}% | W: {band_width:.2f}%")
+
+
+# === Batch evaluation === #
+def scan_sweep_batch(pairs):
+    from .batch_eval import CandleMatrix, bands_readiness, evaluate_bands, sweep_metrics
+
+    names, windows = [], []
+    for pair, candles in fetch_candles_concurrent(pairs):
+        if candles:
+            names.append(pair)
+            windows.append(candles)
+        else:
+            log_coin_scan(pair)
+    if not names:
+        return
+
+    m = CandleMatrix.from_windows(windows)
+    percent_change, band_width = sweep_metrics(m)
+    results = evaluate_bands(m, settings.BANDS, settings.ABSOLUTE_DOLLAR_VOLUME_MIN,
+                             windows=windows, base_granularity=settings.CANDLE_INTERVAL)
+    end_prices = m.closes[:, -1]
+    usd_per_min = m.volumes[:, -1] * end_prices
+    readiness = bands_readiness(results, settings.BANDS)
+
+    for i, pair in enumerate(names):
+        try:
+            band_details = [
+                {"name": name, "stats": stats_from_info(res.info(i))}
+                for name, res in results.items() if res.hit[i]
+            ]
+            report_pair(
+                pair, float(end_prices[i]), float(percent_change[i]), float(band_width[i]),
+                band_details, windows[i].time[-1], usd_per_min=float(usd_per_min[i]),
+                readiness=None if math.isnan(readiness[i]) else float(readiness[i]),
+            )
+        except Exception as e:
+            print(f"Error processing {pair}: {e}")
+
+
+def scan_pairs(pairs):
+    if settings.EVAL_MODE == "batch":
+        scan_sweep_batch(pairs)
+    else:
+        for pair, candles in fetch_candles_concurrent(pairs):
+            try:
+                scan_pair(pair, candles)
+            except Exception as e:
+                print(f"Error processing {pair}: {e}")
+
+
+def scan_sweep(pairs=None, flush=flush_alerts, scheduler=None):
+    """
+    One REST sweep over `pairs` (default: the configured universe), then flush alerts.
+    With a PriorityScheduler the sweep runs most-urgent first, in chunks, with
+    near-trigger pairs re-scanned between chunks and alerts flushed after each.
+    """
+    pairs = all_pairs() if pairs is None else pairs
+    sweep_start = time.monotonic()
+    if scheduler is None:
+        scan_pairs(pairs)
+    else:
+        for chunk in scheduler.chunks(pairs):
+            scan_pairs(chunk)
+            flush()
+    flush()
+    bus.publish(SWEEP_DONE, {"pairs": len(pairs), "sweep_sec": time.monotonic() - sweep_start})
+
+
+class ScannerEngine:
+    """
+    The REST scan loop as a managed task: run() blocks, start() runs it on a
+    background task (a daemon thread unless `spawn` is given, e.g. the WebUI
+    server's socketio.start_background_task). `pairs` is a list, a callable
+    returning one (re-evaluated every sweep), or None for all_pairs().
+    pause()/resume() take effect
+    between sweeps; stop() ends the loop. `flush` replaces flush_alerts() as
+    the end-of-sweep alert sink (a shard forwards its alerts instead).
+    """
+
+    def __init__(self, pairs=None, spawn=None, flush=None):
+        self.pairs = pairs
+        self._spawn = spawn
+        self._flush = flush
+        self.scheduler = PriorityScheduler() if PRIORITY_SCHEDULING else None
+        self._task = None
+        self._stop = threading.Event()
+        self._active = threading.Event()
+        self._active.set()
+        self.sweeps = 0
+        self.last_sweep_sec = 0.0
+
+    @property
+    def running(self):
+        return self._active.is_set()
+
+    def current_pairs(self):
+        if self.pairs is None:
+            return all_pairs()
+        return self.pairs() if callable(self.pairs) else self.pairs
+
+    def start(self):
+        if self._task is None:
+            if self._spawn is not None:
+                self._task = self._spawn(self.run)
+            else:
+                self._task = threading.Thread(target=self.run, name="scanner", daemon=True)
+                self._task.start()
+        return self
+
+    def pause(self):
+        self._active.clear()
+
+    def resume(self):
+        self._active.set()
+
+    def stop(self):
+        self._stop.set()
+        self._active.set()
+
+    def update_settings(self, data):
+        """Apply a WebUI settings dict to the running engine."""
+        settings.apply_webui_settings(data)
+
+    def run(self):
+        if self._flush is None:
+            get_dispatcher()
+        universe.attach(bus)
+        if self.scheduler is not None:
+            self.scheduler.attach(bus)
+        load_from_archive(self.current_pairs())
+        while not self._stop.is_set():
+            if not self._active.wait(1):
+                continue
+            # Hot pairs every sweep, warm/cold ones every few (see universe.py)
+            candidates = self.current_pairs()
+            pairs = universe.select(candidates, self.sweeps)
+            sweep_start = time.monotonic()
+            try:
+                scan_sweep(pairs, flush=self._flush or flush_alerts, scheduler=self.scheduler)
+            except Exception as e:
+                print(f"❌ Scanner error: {e}", flush=True)
+            self.last_sweep_sec = time.monotonic() - sweep_start
+            self.sweeps += 1
+
+            interval = settings.scanner_settings.scan_interval
+            print(f"Swept {len(pairs)}/{len(candidates)} pairs in {self.last_sweep_sec:.2f}s")
+            print(f"Sleeping {interval} seconds...\n")
+            self._stop.wait(interval)
+
+
+def load_from_archive(pairs):
+    """Warm restart: fill the candle cache from disk; returns the pairs that are already current."""
+    load_start = time.monotonic()
+    fresh = warm_start(pairs)
+    if fresh:
+        print(f"Warm start: {len(fresh)}/{len(pairs)} pairs loaded from disk in "
+              f"{(time.monotonic() - load_start) * 1000:.0f}ms")
+    return fresh
+
+
+def run_rest_scanner():
+    ScannerEngine().run()
+
+
+# === Streaming ingestion === #
+# O(1) per-update detectors for every (pair, band) fed by the stream, and the
+# stream's candle rings; both set up by run_stream_scanner()
+band_detectors = None
+stream_candles = None
+
+def refresh_band_detectors():
+    """
+    Rebuild the detectors after the bands changed (see apply_webui_settings) and
+    grow the stream's rings to the new history. Pairs are re-seeded from their
+    rings as their next candle arrives.
+    """
+    global band_detectors
+    from .streaming_detector import DetectorBank
+
+    band_detectors = DetectorBank(settings.BANDS, settings.CANDLE_INTERVAL)
+    stream_candles.resize(settings.history_periods())
+    print(f"Stream detectors rebuilt for bands {[b.name for b in settings.BANDS]}", flush=True)
+
+
+def scan_stream_pair(pair, candles):
+    """Streaming counterpart of scan_pair: band hits come from the incremental detectors."""
+    if not candles:
+        log_coin_scan(pair)
+        return
+
+    if band_detectors.all_bands != settings.BANDS:
+        refresh_band_detectors()
+    if pair not in band_detectors:
+        band_detectors.seed(pair, candles[:-1], settings.ABSOLUTE_DOLLAR_VOLUME_MIN)
+
+    end_price, percent_change, band_width = sweep_stats(candles)
+    band_details = [
+        {"name": name, "stats": stats_from_info(info)}
+        for name, hit, info in band_detectors.update(pair, candles[-1], settings.ABSOLUTE_DOLLAR_VOLUME_MIN)
+        if hit
+    ]
+    if band_detectors.coarse:
+        # Bands on coarser candles are evaluated on the resampled ring window
+        band_details += assess_bands(candles, band_detectors.coarse)[0]
+    report_pair(
+        pair, end_price, percent_change, band_width, band_details, candles.time[-1],
+        usd_per_min=candles.volume[-1] * end_price,
+    )
+
+
+def scan_closed_stream_pair(pair, candles):
+    """on_close handler: persist the candle that just closed, then evaluate it."""
+    if candles:
+        archive_candles(pair, settings.CANDLE_INTERVAL, [candles[-1]], now=candles.time[-1] + settings.CANDLE_INTERVAL)
+    scan_stream_pair(pair, candles)
+
+
+def run_stream_scanner(pairs=None, flush=None):
+    global band_detectors, stream_candles
+    # websockets is only needed in stream mode
+    from .streaming_detector import DetectorBank
+    from .ws_ingest import StreamIngestor, WS_FEED_URL
+
+    pairs = all_pairs() if pairs is None else pairs
+    band_detectors = DetectorBank(settings.BANDS, settings.CANDLE_INTERVAL)
+    ingestor = StreamIngestor(
+        pairs,
+        on_close=scan_closed_stream_pair,
+        on_intrabar=scan_stream_pair if settings.STREAM_INTRABAR else None,
+        url=WS_FEED_URL,
+        channel=settings.STREAM_CHANNEL,
+        granularity=settings.CANDLE_INTERVAL,
+        maxlen=settings.history_periods(),
+        intrabar_interval=settings.STREAM_INTRABAR_SEC,
+        record_path=settings.STREAM_RECORD or None,
+    )
+    stream_candles = ingestor.aggregator
+
+    # Seed history so the bands are armed immediately instead of after a warm-up:
+    # from the on-disk archive where it is current, over REST for everything else
+    seed_start = time.monotonic()
+    fresh = set(load_from_archive(pairs))
+    window_start = time.time() - settings.CANDLE_INTERVAL * settings.history_periods()
+    seeded = [
+        (pair, candle_cache.window(pair, settings.CANDLE_INTERVAL, start_time=window_start, n=settings.lookback_candles))
+        for pair in fresh
+    ]
+    seeded += fetch_candles_concurrent([pair for pair in pairs if pair not in fresh])
+    for pair, candles in seeded:
+        if candles:
+            ingestor.aggregator.seed(pair, candles)
+            band_detectors.seed(pair, candles, settings.ABSOLUTE_DOLLAR_VOLUME_MIN)
+    print(f"Seeded {len(pairs)} pairs ({len(fresh)} from disk) in {time.monotonic() - seed_start:.2f}s")
+
+    if flush is None:
+        get_dispatcher()
+    alert_coalescer.start_flusher(ALERT_DIGEST_SEC, flush or flush_alerts)
+    ingestor.run()
@@ -0,0 +1,87 @@
+# Sweep ordering for the REST scanner.
+# A rate-limited REST sweep of a few hundred pairs takes tens of seconds, so the
+# order matters: a pair that is about to break out should not wait behind
+# everything before it alphabetically. PriorityScheduler keeps each pair's
+# readiness (how close its nearest band is to firing, from the previous scan; see
+# detection.band_readiness) and band width, and orders every sweep through a
+# priority queue: pairs not yet scanned first, then readiness, then band width.
+# The sweep runs in chunks of PRIORITY_CHUNK pairs; after each chunk the pairs
+# with readiness >= PRIORITY_FAST_READINESS that have not been refreshed for
+# PRIORITY_FAST_SEC are scanned again (at most PRIORITY_FAST_MAX of them), so
+# near-trigger pairs are re-checked every few seconds, not once per sweep.
+import heapq
+import os
+import threading
+import time
+
+from .events import SCAN_RESULT
+
+PRIORITY_SCHEDULING = os.getenv("PRIORITY_SCHEDULING", "1") == "1"
+PRIORITY_CHUNK = int(os.getenv("PRIORITY_CHUNK", "40"))                           # pairs between fast-lane checks
+PRIORITY_FAST_READINESS = float(os.getenv("PRIORITY_FAST_READINESS", "0.7"))      # near-trigger cutoff
+PRIORITY_FAST_SEC = float(os.getenv("PRIORITY_FAST_SEC", "3"))                    # min gap between refreshes
+PRIORITY_FAST_MAX = int(os.getenv("PRIORITY_FAST_MAX", "10"))                     # fast-lane pairs per chunk
+
+
+class PriorityScheduler:
+    def __init__(self, chunk=PRIORITY_CHUNK, fast_readiness=PRIORITY_FAST_READINESS,
+                 fast_sec=PRIORITY_FAST_SEC, fast_max=PRIORITY_FAST_MAX):
+        self.chunk = chunk
+        self.fast_readiness = fast_readiness
+        self.fast_sec = fast_sec
+        self.fast_max = fast_max
+        self._state = {}          # pair -> (readiness, band_width, scanned_at)
+        self._lock = threading.Lock()
+        self._attached = False
+        self.fast_scans = 0
+
+    def attach(self, bus):
+        """Learn readiness from the engine's scan results (idempotent)."""
+        if not self._attached:
+            self._attached = True
+            bus.subscribe(SCAN_RESULT, self.record)
+
+    def record(self, data, now=None):
+        readiness = data.get("readiness")
+        with self._lock:
+            self._state[data["symbol"]] = (
+                float("-inf") if readiness is None else readiness,
+                data.get("band_width") or 0.0,
+                time.monotonic() if now is None else now,
+            )
+
+    def order(self, pairs):
+        """`pairs` most urgent first."""
+        with self._lock:
+            state = dict(self._state)
+        heap = []
+        for i, pair in enumerate(pairs):
+            s = state.get(pair)
+            # Unscanned pairs first; ties keep the given order
+            key = (0, 0.0, 0.0, i) if s is None else (1, -s[0], -s[1], i)
+            heap.append((key, pair))
+        heapq.heapify(heap)
+        return [heapq.heappop(heap)[1] for _ in range(len(heap))]
+
+    def fast_lane(self, pairs, now=None):
+        """Near-trigger pairs among `pairs` that are due for a refresh, most ready first."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            due = [
+                (s[0], pair) for pair in pairs
+                if (s := self._state.get(pair)) is not None
+                and s[0] >= self.fast_readiness and now - s[2] >= self.fast_sec
+            ]
+        return [pair for _, pair in heapq.nlargest(self.fast_max, due)]
+
+    def chunks(self, pairs):
+        """Yield the sweep in priority order, chunk by chunk, with the fast lane after each chunk."""
+        ordered = self.order(pairs)
+        allowed = set(ordered)
+        for start in range(0, len(ordered), self.chunk):
+            yield ordered[start:start + self.chunk]
+            if start + self.chunk < len(ordered):
+                fast = self.fast_lane(allowed)
+                if fast:
+                    self.fast_scans += len(fast)
+                    yield fast
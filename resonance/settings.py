@@ -0,0 +1,506 @@
+# Scanner configuration.
+# Env-driven constants plus the WebUI-adjustable ScannerSettings. Other modules
+# read these as `settings.NAME` at call time, so updates made through
+# apply_webui_settings() take effect without a restart.
+import os
+
+from .bands import Band, bands_from_dicts, parse_bands, required_history as bands_history
+
+# ===== Alert display mode =====
+# Default is Simple Mode - standard detection readout
+SIMPLE_MODE = os.getenv("SIMPLE_MODE", "1") == "0"   # set SIMPLE_MODE=0 to enable Pro mode
+
+# Absolute dollar-volume floor (quote currency per 1m candle).
+# Can be overridden with a Railway env var: ABS_VOL_MIN_USD
+ABSOLUTE_DOLLAR_VOLUME_MIN = float(os.getenv("ABS_VOL_MIN_USD", "2000"))
+
+
+# === CONFIGURATION === #
+COINS = [
+    
+"00-USD",
+"1INCH-USD",
+"A8-USD",
+"AAVE-USD",
+"ABT-USD",
+"ACH-USD",
+"ACS-USD",
+"ACX-USD",
+"ADA-USD",
+"AERGO-USD",
+"AERO-USD",
+"AGLD-USD",
+"AIOZ-USD",
+"AKT-USD",
+"ALCX-USD",
+"ALEO-USD",
+"ALEPH-USD",
+"ALGO-USD",
+"ALICE-USD",
+"ALT-USD",
+"AMP-USD",
+"ANKR-USD",
+"APE-USD",
+"API3-USD",
+"APT-USD",
+"ARB-USD",
+"ARKM-USD",
+"ARPA-USD",
+"ASM-USD",
+"AST-USD",
+"ATH-USD",
+"ATOM-USD",
+"AUCTION-USD",
+"AUDIO-USD",
+"AURORA-USD",
+"AVAX-USD",
+"AVT-USD",
+"AXL-USD",
+"AXS-USD",
+"B3-USD",
+"BADGER-USD",
+"BAL-USD",
+"BAND-USD",
+"BAT-USD",
+"BCH-USD",
+"BERA-USD",
+"BICO-USD",
+"BIGTIME-USD",
+"BIO-USD",
+"BLAST-USD",
+"BLUR-USD",
+"BLZ-USD",
+"BNKR-USD",
+"BNT-USD",
+"BOBA-USD",
+"BONK-USD",
+"BTC-USD",
+"BTRST-USD",
+"C98-USD",
+"CAKE-USD",
+"CBETH-USD",
+"CELR-USD",
+"CGLD-USD",
+"CHZ-USD",
+"CLANKER-USD",
+"CLV-USD",
+"COMP-USD",
+"COOKIE-USD",
+"CORECHAIN-USD",
+"COTI-USD",
+"COW-USD",
+"CRO-USD",
+"CRV-USD",
+"CTSI-USD",
+"CTX-USD",
+"CVC-USD",
+"CVX-USD",
+"DAI-USD",
+"DASH-USD",
+"DEGEN-USD",
+"DEXT-USD",
+"DIA-USD",
+"DIMO-USD",
+"DNT-USD",
+"DOGE-USD",
+"DOGINME-USD",
+"DOT-USD",
+"DRIFT-USD",
+"EDGE-USD",
+"EGLD-USD",
+"EIGEN-USD",
+"ELA-USD",
+"ENA-USD",
+"ENS-USD",
+"EOS-USD",
+"ERA-USD",
+"ERN-USD",
+"ETC-USD",
+"ETH-USD",
+"ETHFI-USD",
+"FAI-USD",
+"FARM-USD",
+"FARTCOIN-USD",
+"FET-USD",
+"FIDA-USD",
+"FIL-USD",
+"FIS-USD",
+"FLOKI-USD",
+"FLOW-USD",
+"FLR-USD",
+"FORT-USD",
+"FORTH-USD",
+"FOX-USD",
+"FX-USD",
+"G-USD",
+"GFI-USD",
+"GHST-USD",
+"GIGA-USD",
+"GLM-USD",
+"GMT-USD",
+"GNO-USD",
+"GODS-USD",
+"GRT-USD",
+"GST-USD",
+"GTC-USD",
+"HBAR-USD",
+"HFT-USD",
+"HIGH-USD",
+"HNT-USD",
+"HOME-USD",
+"HONEY-USD",
+"HOPR-USD",
+"ICP-USD",
+"IDEX-USD",
+"ILV-USD",
+"IMX-USD",
+"INDEX-USD",
+"INJ-USD",
+"INV-USD",
+"IO-USD",
+"IOTX-USD",
+"IP-USD",
+"JASMY-USD",
+"JITOSOL-USD",
+"JTO-USD",
+"KAITO-USD",
+"KARRAT-USD",
+"KAVA-USD",
+"KERNEL-USD",
+"KEYCAT-USD",
+"KNC-USD",
+"KRL-USD",
+"KSM-USD",
+"L3-USD",
+"LA-USD",
+"LCX-USD",
+"LDO-USD",
+"LINK-USD",
+"LOKA-USD",
+"LPT-USD",
+"LQTY-USD",
+"LRC-USD",
+"LRDS-USD",
+"LSETH-USD",
+"LTC-USD",
+"MAGIC-USD",
+"MANA-USD",
+"MANTLE-USD",
+"MASK-USD",
+"MATH-USD",
+"MATIC-USD",
+"MDT-USD",
+"ME-USD",
+"METIS-USD",
+"MINA-USD",
+"MKR-USD",
+"MLN-USD",
+"MNDE-USD",
+"MOG-USD",
+"MOODENG-USD",
+"MORPHO-USD",
+"MPLX-USD",
+"MSOL-USD",
+"MUSE-USD",
+"NCT-USD",
+"NEAR-USD",
+"NEON-USD",
+"NEWT-USD",
+"NKN-USD",
+"NMR-USD",
+"OCEAN-USD",
+"OGN-USD",
+"OMNI-USD",
+"ONDO-USD",
+"OP-USD",
+"ORCA-USD",
+"OSMO-USD",
+"OXT-USD",
+"PAXG-USD",
+"PENDLE-USD",
+"PENGU-USD",
+"PEPE-USD",
+"PERP-USD",
+"PIRATE-USD",
+"PLU-USD",
+"PNG-USD",
+"PNUT-USD",
+"POL-USD",
+"POLS-USD",
+"POND-USD",
+"POPCAT-USD",
+"POWR-USD",
+"PRCL-USD",
+"PRIME-USD",
+"PRO-USD",
+"PROMPT-USD",
+"PUMP-USD",
+"PUNDIX-USD",
+"PYR-USD",
+"PYTH-USD",
+"QI-USD",
+"QNT-USD",
+"RAD-USD",
+"RARE-USD",
+"RARI-USD",
+"RED-USD",
+"RENDER-USD",
+"REQ-USD",
+"REZ-USD",
+"RLC-USD",
+"RONIN-USD",
+"ROSE-USD",
+"RPL-USD",
+"RSC-USD",
+"RSR-USD",
+"S-USD",
+"SAFE-USD",
+"SAND-USD",
+"SD-USD",
+"SEAM-USD",
+"SEI-USD",
+"SHDW-USD",
+"SHIB-USD",
+"SHPING-USD",
+"SKL-USD",
+"SKY-USD",
+"SNX-USD",
+"SOL-USD",
+"SPA-USD",
+"SPELL-USD",
+"SPK-USD",
+"SQD-USD",
+"STG-USD",
+"STORJ-USD",
+"STRK-USD",
+"STX-USD",
+"SUI-USD",
+"SUKU-USD",
+"SUPER-USD",
+"SUSHI-USD",
+"SWELL-USD",
+"SWFTC-USD",
+"SXT-USD",
+"SYRUP-USD",
+"T-USD",
+"TAO-USD",
+"TIA-USD",
+"TIME-USD",
+"TNSR-USD",
+"TOSHI-USD",
+"TRAC-USD",
+"TRB-USD",
+"TREE-USD",
+"TRU-USD",
+"TRUMP-USD",
+"TURBO-USD",
+"UMA-USD",
+"UNI-USD",
+"USDS-USD",
+"USDT-USD",
+"VARA-USD",
+"VELO-USD",
+"VET-USD",
+"VOXEL-USD",
+"VTHO-USD",
+"VVV-USD",
+"W-USD",
+"WAXL-USD",
+"WCFG-USD",
+"WELL-USD",
+"WIF-USD",
+"WLD-USD",
+"XCN-USD",
+"XLM-USD",
+"XRP-USD",
+"XTZ-USD",
+"XYO-USD",
+"YFI-USD",
+"ZEC-USD",
+"ZEN-USD",
+"ZETA-USD",
+"ZETACHAIN-USD",
+"ZK-USD",
+"ZORA-USD",
+"ZRO-USD",
+"ZRX-USD"
+
+]
+
+USDC_ONLY_COINS = []
+
+DISCORD_WEBHOOK = "ADD YOUR DISCORD WEBHOOK HERE"
+
+# === Telegram Configuration ===
+TELEGRAM_BOT_TOKEN = "ADD YOUR TELEGRAM BOT TOKEN HERE"  # Get from @BotFather
+TELEGRAM_CHAT_ID = "ADD YOUR TELEGRAM CHAT ID HERE"      # Your chat ID or channel ID
+
+# === Breakout Scanner Parameters ===
+CANDLE_INTERVAL = 60  # seconds
+
+CANDLE_COUNT_FAST = 10
+CANDLE_COUNT_MEDIUM = 15
+CANDLE_COUNT_SLOW = 20
+
+BREAKOUT_THRESHOLD_FAST = 0.013
+BREAKOUT_THRESHOLD_MEDIUM = 0.018
+BREAKOUT_THRESHOLD_SLOW = 0.024
+
+VOLUME_SPIKE_RATIO_FAST = 1.3
+VOLUME_SPIKE_RATIO_MEDIUM = 1.7
+VOLUME_SPIKE_RATIO_SLOW = 2.2
+
+# The band registry, in alert order (see bands.py). BANDS overrides the three
+# defaults above with any number of bands, comma-separated:
+#   NAME:window:threshold:ratio[:volume_floor[:granularity]]
+# e.g. BANDS="FAST:10:0.013:1.3,SLOW:20:0.024:2.2,H5:12:0.03:2.0:5000:300"
+# An empty volume_floor uses ABS_VOL_MIN_USD; granularity (seconds, a multiple
+# of CANDLE_INTERVAL) defaults to CANDLE_INTERVAL. The WebUI can edit them too.
+BANDS = parse_bands(os.getenv("BANDS", "")) or [
+    Band("FAST",   CANDLE_COUNT_FAST,   BREAKOUT_THRESHOLD_FAST,   VOLUME_SPIKE_RATIO_FAST),
+    Band("MEDIUM", CANDLE_COUNT_MEDIUM, BREAKOUT_THRESHOLD_MEDIUM, VOLUME_SPIKE_RATIO_MEDIUM),
+    Band("SLOW",   CANDLE_COUNT_SLOW,   BREAKOUT_THRESHOLD_SLOW,   VOLUME_SPIKE_RATIO_SLOW),
+]
+
+def required_history(bands=None):
+    """CANDLE_INTERVAL candles a band set needs per pair: its longest window (coarser bands count in base candles)."""
+    return bands_history(BANDS if bands is None else bands, CANDLE_INTERVAL)
+
+# Candles fetched and kept per pair. Derived from the bands so every band sees its
+# full window; a band is skipped while a pair has fewer candles than it needs.
+lookback_candles = required_history()
+
+# Extra candle periods fetched and cached beyond lookback_candles. Minutes without
+# trades have no candle, and the newest one may not have formed yet, so a window of
+# exactly lookback_candles periods would often hold fewer candles than the bands need.
+HISTORY_SLACK_CANDLES = int(os.getenv("HISTORY_SLACK_CANDLES", "2"))
+
+def history_periods(bands=None):
+    """Candle periods fetched and cached per pair; the newest required_history() candles of them are evaluated."""
+    return required_history(bands) + HISTORY_SLACK_CANDLES
+
+BASE_URL = "https://api.exchange.coinbase.com"
+
+# === Ingestion / evaluation modes === #
+# Max number of candle requests in flight at once. Override with FETCH_CONCURRENCY.
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "16"))
+
+# INGEST_MODE=rest polls /candles every cycle; INGEST_MODE=stream builds 1m candles
+# from the WebSocket matches feed and evaluates the bands as each candle closes.
+INGEST_MODE = os.getenv("INGEST_MODE", "rest").lower()
+STREAM_CHANNEL = os.getenv("STREAM_CHANNEL", "matches")
+STREAM_INTRABAR = os.getenv("STREAM_INTRABAR", "0") == "1"    # also evaluate the forming candle
+STREAM_INTRABAR_SEC = float(os.getenv("STREAM_INTRABAR_SEC", "1.0"))
+STREAM_RECORD = os.getenv("STREAM_RECORD", "")                 # append raw feed messages to this JSONL file
+
+# EVAL_MODE=pair evaluates each pair as its candles arrive; EVAL_MODE=batch collects the
+# whole sweep and evaluates every band for every pair in a few NumPy operations.
+EVAL_MODE = os.getenv("EVAL_MODE", "pair").lower()
+
+SCAN_INTERVAL = 2  # seconds between REST sweeps
+
+# SCAN_SHARDS > 1 splits the pairs across that many scanner processes (see sharding.py);
+# alerts and WebUI events are still published from the main process.
+SCAN_SHARDS = int(os.getenv("SCAN_SHARDS", "1"))
+
+# COORD_DB points instances at a shared SQLite file; they then split the pairs by lease
+# and send each breakout once (see coordinator.py). Empty = scan everything alone.
+COORD_DB = os.getenv("COORD_DB", "")
+
+# UNIVERSE_FILE: scan the JSON list of pairs in this file (e.g. top50_usd_pairs.txt from
+# top50coinsfetcher.py) instead of COINS; edits are picked up on the next sweep.
+UNIVERSE_FILE = os.getenv("UNIVERSE_FILE", "")
+# Where the pairs come from: coins (the list above), file (UNIVERSE_FILE) or products
+# (every online USD pair on the exchange). See universe.py for filtering and tiers.
+UNIVERSE_SOURCE = os.getenv("UNIVERSE_SOURCE", "file" if UNIVERSE_FILE else "coins").lower()
+UNIVERSE_CHECK_LISTING = os.getenv("UNIVERSE_CHECK_LISTING", "1") == "1"   # drop pairs not online on the exchange
+UNIVERSE_REFRESH_SEC = int(os.getenv("UNIVERSE_REFRESH_SEC", "3600"))       # how often the listing is re-read
+
+
+# Scanner settings that can be controlled from WebUI
+class ScannerSettings:
+    def __init__(self):
+        self.scan_interval = SCAN_INTERVAL
+        self.volume_floor = ABSOLUTE_DOLLAR_VOLUME_MIN
+        self.alert_mode = 'simple' if SIMPLE_MODE else 'pro'
+        self.bands = [b.to_dict() for b in BANDS]
+        self.discord_webhook = ""
+        self.telegram_token = ""
+        self.telegram_chat_id = ""
+        
+    @staticmethod
+    def update_band(bands, key, value):
+        """Apply a '<band>_<field>' key such as fast_threshold or slow_window; False if it names no band."""
+        for band in bands:
+            prefix = band["name"].lower() + "_"
+            if key.startswith(prefix):
+                field = key[len(prefix):]
+                field = "volume_floor" if field == "floor" else field
+                if field in band and field != "name":
+                    band[field] = value
+                    return True
+        return False
+
+    def update_from_webui(self, settings_dict):
+        """Update settings from WebUI. Everything is validated first: a bad value changes nothing."""
+        if not isinstance(settings_dict, dict):
+            raise ValueError("settings: expected a JSON object")
+        updates = {}
+        bands = [dict(b) for b in self.bands]
+        for key, value in settings_dict.items():
+            if key == 'bands':
+                # The whole registry: a BANDS spec string or a list of band dicts
+                new = parse_bands(value) if isinstance(value, str) else bands_from_dicts(value)
+                if new:
+                    bands = [b.to_dict() for b in new]
+            elif hasattr(self, key):
+                # Convert string values to appropriate types
+                try:
+                    if key in ['scan_interval']:
+                        updates[key] = int(value)
+                    elif key in ['volume_floor']:
+                        updates[key] = float(value)
+                    else:
+                        updates[key] = str(value)
+                except TypeError:
+                    raise ValueError(f"{key}: expected a number, got {value!r}") from None
+            else:
+                self.update_band(bands, key, value)
+        # Normalised and validated as a whole
+        bands = bands_from_dicts(bands)
+        required_history(bands)     # granularities must be multiples of CANDLE_INTERVAL
+
+        for key, value in updates.items():
+            setattr(self, key, value)
+        self.bands = [b.to_dict() for b in bands]
+
+        print(f"Settings updated: {settings_dict}")
+
+# Global settings instance
+scanner_settings = ScannerSettings()
+
+
+def apply_webui_settings(new_settings):
+    """Handle settings update from WebUI"""
+    global ABSOLUTE_DOLLAR_VOLUME_MIN, SIMPLE_MODE, BANDS, lookback_candles
+    global DISCORD_WEBHOOK, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+
+    scanner_settings.update_from_webui(new_settings)
+    s = scanner_settings
+
+    # Update module-level configuration read by the engine
+    ABSOLUTE_DOLLAR_VOLUME_MIN = s.volume_floor
+    SIMPLE_MODE = (s.alert_mode == 'simple')
+    BANDS = bands_from_dicts(s.bands)
+    lookback_candles = required_history()
+    # Bands may now need more history than the candle cache holds
+    from .ingestion import candle_cache
+    candle_cache.resize(history_periods())
+
+    # Update alert configurations
+    if s.discord_webhook:
+        DISCORD_WEBHOOK = s.discord_webhook
+    if s.telegram_token:
+        TELEGRAM_BOT_TOKEN = s.telegram_token
+    if s.telegram_chat_id:
+        TELEGRAM_CHAT_ID = s.telegram_chat_id
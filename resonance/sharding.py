@@ -0,0 +1,275 @@
+# Sharded scanning across processes.
+# One scanner process is bound by the GIL: JSON parsing, candle bookkeeping and
+# band evaluation for every pair share a core. With SCAN_SHARDS=N the pairs are
+# split over N worker processes by consistent hash, so adding a shard (or pairs)
+# only moves ~1/N of the pairs. Each shard runs a complete engine over its
+# pairs - its own HTTP session, rate limiter, candle cache and detectors - but
+# instead of sending alerts it forwards them, with its event-bus traffic, to the
+# main process. There ShardedScanner feeds them into the usual coalescer,
+# dispatcher and event bus, so alert digests, cooldown and the WebUI see one
+# scanner.
+import bisect
+import hashlib
+import multiprocessing
+import queue
+import threading
+import time
+
+from . import rate_limiter, settings
+from .alert_coalescer import ALERT_DIGEST_SEC
+from .events import BREAKOUT_ALERT, SCAN_RESULT, SWEEP_DONE, bus
+
+SHARD_REPLICAS = 64     # points per shard on the hash ring
+SHARD_RESTART_SEC = 5   # min seconds between restarts of a crashed shard
+
+
+def key_hash(key):
+    """Stable 64-bit hash of a string (unlike hash(), the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class ShardRing:
+    """Consistent hash ring mapping pair names to shard numbers 0..shards-1."""
+
+    def __init__(self, shards, replicas=SHARD_REPLICAS):
+        self.shards = shards
+        points = sorted((key_hash(f"shard-{s}-{r}"), s) for s in range(shards) for r in range(replicas))
+        self._keys = [h for h, _ in points]
+        self._shards = [s for _, s in points]
+
+    def shard_for(self, key):
+        i = bisect.bisect(self._keys, key_hash(key)) % len(self._keys)
+        return self._shards[i]
+
+    def partition(self, keys):
+        """Split `keys` into one list per shard, keeping their order."""
+        parts = [[] for _ in range(self.shards)]
+        for key in keys:
+            parts[self.shard_for(key)].append(key)
+        return parts
+
+
+# === Shard side === #
+
+class _Forwarder:
+    """Collects a shard's alerts and bus events and ships them to the publisher in batches."""
+
+    def __init__(self, index, out, topics):
+        self.index = index
+        self.out = out
+        self._events = []
+        self._lock = threading.Lock()
+        for topic in topics:
+            bus.subscribe(topic, lambda data, topic=topic: self._buffer(topic, data))
+
+    def _buffer(self, topic, data):
+        with self._lock:
+            self._events.append((topic, data))
+
+    def flush(self):
+        """Stand-in for flush_alerts(): hand pending alerts and buffered events to the publisher."""
+        from .alerting import alert_coalescer
+
+        alerts = alert_coalescer.drain()
+        with self._lock:
+            events, self._events = self._events, []
+        if alerts:
+            self.out.put(("alerts", self.index, alerts))
+        if events:
+            self.out.put(("events", self.index, events))
+
+    def sweep_done(self, sweep_sec, pairs):
+        self.out.put(("sweep", self.index, {"pairs": pairs, "sweep_sec": sweep_sec}))
+
+
+def _run_shard(index, shards, mode, eval_mode, webui_settings, out, control, forward_events):
+    """Process entry point: scan this shard's pairs until stopped."""
+    settings.INGEST_MODE = mode
+    settings.EVAL_MODE = eval_mode
+    if webui_settings:
+        settings.apply_webui_settings(webui_settings)
+    # Imported after the settings are applied, so the candle cache is sized for them
+    from .scanner import ScannerEngine, all_pairs, run_stream_scanner
+    # The exchange limit is per IP, so each shard gets an equal slice of it
+    rps, burst = rate_limiter.DEFAULT_LIMITS["public"]
+    rate_limiter.DEFAULT_LIMITS["public"] = (rps / shards, max(1, burst // shards))
+
+    ring = ShardRing(shards)
+
+    def own_pairs():
+        # Re-partitioned every sweep, so a reloaded universe is picked up
+        return ring.partition(all_pairs())[index]
+
+    forwarder = _Forwarder(index, out, (SCAN_RESULT, BREAKOUT_ALERT) if forward_events else ())
+    engine = ScannerEngine(own_pairs, flush=forwarder.flush)
+    bus.subscribe(SWEEP_DONE, lambda data: forwarder.sweep_done(data["sweep_sec"], data["pairs"]))
+    print(f"[Shard {index}/{shards}] scanning {len(own_pairs())} pairs", flush=True)
+
+    def follow_control():
+        while True:
+            cmd, arg = control.get()
+            if cmd == "settings":
+                settings.apply_webui_settings(arg)
+            elif cmd == "pause":
+                engine.pause()
+            elif cmd == "resume":
+                engine.resume()
+            elif cmd == "stop":
+                engine.stop()
+                return
+
+    threading.Thread(target=follow_control, name="shard-control", daemon=True).start()
+    try:
+        if mode == "stream":
+            run_stream_scanner(own_pairs(), flush=forwarder.flush)
+        else:
+            engine.run()
+    except KeyboardInterrupt:
+        pass
+
+
+# === Publisher side === #
+
+class ShardedScanner:
+    """
+    Runs SCAN_SHARDS scanner processes and publishes their results from this
+    one. Same controls as ScannerEngine: start() (non-blocking) or run()
+    (blocking), pause()/resume()/stop(), update_settings(). A shard process that
+    dies is restarted. `forward_events` ships per-pair scan results too (needed
+    by the WebUI, not by the CLI).
+    """
+
+    def __init__(self, shards=None, spawn=None, forward_events=True):
+        self.shards = settings.SCAN_SHARDS if shards is None else shards
+        self._spawn = spawn
+        self.forward_events = forward_events
+        self._ctx = multiprocessing.get_context("spawn")
+        self._out = None
+        self._procs = []
+        self._controls = []
+        self._started_at = {}
+        self._task = None
+        self._stop = threading.Event()
+        self._active = threading.Event()
+        self._active.set()
+        self.sweeps = 0
+        self.last_sweep_sec = 0.0
+        self.restarts = 0
+
+    @property
+    def running(self):
+        return self._active.is_set()
+
+    def _start_shard(self, index):
+        proc = self._ctx.Process(
+            target=_run_shard,
+            name=f"scanner-shard-{index}",
+            args=(index, self.shards, settings.INGEST_MODE, settings.EVAL_MODE,
+                  vars(settings.scanner_settings), self._out, self._controls[index], self.forward_events),
+            daemon=True,
+        )
+        proc.start()
+        self._started_at[index] = time.monotonic()
+        if not self._active.is_set():
+            self._controls[index].put(("pause", None))
+        return proc
+
+    def start(self):
+        if self._task is None:
+            self._out = self._ctx.Queue()
+            self._controls = [self._ctx.Queue() for _ in range(self.shards)]
+            self._procs = [self._start_shard(i) for i in range(self.shards)]
+            if self._spawn is not None:
+                self._task = self._spawn(self._publish)
+            else:
+                self._task = threading.Thread(target=self._publish, name="shard-publisher", daemon=True)
+                self._task.start()
+        return self
+
+    def run(self):
+        self.start()
+        try:
+            while not self._stop.wait(1):
+                pass
+        finally:
+            self.stop()
+
+    def _send(self, cmd, arg=None):
+        for control in self._controls:
+            control.put((cmd, arg))
+
+    def pause(self):
+        self._active.clear()
+        self._send("pause")
+
+    def resume(self):
+        self._active.set()
+        self._send("resume")
+
+    def update_settings(self, data):
+        settings.apply_webui_settings(data)
+        self._send("settings", data)
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._send("stop")
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+    def _publish(self):
+        """Merge the shards' output: alerts into one coalescer/digest, events onto the local bus."""
+        from .alerting import alert_coalescer, flush_alerts, get_dispatcher
+
+        get_dispatcher()
+        round_done = {}               # shard -> sweep report for the sweep in progress
+        pending_since = None
+        while not self._stop.is_set():
+            try:
+                kind, index, payload = self._out.get(timeout=ALERT_DIGEST_SEC)
+            except queue.Empty:
+                kind = None
+            except (EOFError, OSError):
+                break
+
+            if kind == "alerts":
+                for alert in payload:
+                    alert_coalescer.add(alert)
+                if pending_since is None:
+                    pending_since = time.monotonic()
+            elif kind == "events":
+                for topic, data in payload:
+                    bus.publish(topic, data)
+            elif kind == "sweep":
+                round_done[index] = payload
+                if len(round_done) == len(self._procs):
+                    # Every shard has swept: one digest and one SWEEP_DONE for the whole universe
+                    flush_alerts()
+                    pending_since = None
+                    self.sweeps += 1
+                    self.last_sweep_sec = max(r["sweep_sec"] for r in round_done.values())
+                    bus.publish(SWEEP_DONE, {"pairs": sum(r["pairs"] for r in round_done.values()),
+                                             "sweep_sec": self.last_sweep_sec})
+                    round_done = {}
+
+            # Stream mode (or a stalled shard): don't hold alerts longer than a digest period
+            if pending_since is not None and time.monotonic() - pending_since >= ALERT_DIGEST_SEC:
+                flush_alerts()
+                pending_since = None
+
+            for i, proc in enumerate(self._procs):
+                if (not proc.is_alive() and not self._stop.is_set()
+                        and time.monotonic() - self._started_at[i] >= SHARD_RESTART_SEC):
+                    print(f"⚠️ Scanner shard {i} exited (code {proc.exitcode}); restarting", flush=True)
+                    self.restarts += 1
+                    round_done.pop(i, None)
+                    self._procs[i] = self._start_shard(i)
+        flush_alerts()
+
+
+def run_sharded_scanner(shards=None):
+    """CLI entry point: scan with `shards` processes, publishing from this one."""
+    ShardedScanner(shards, forward_events=False).run()
@@ -0,0 +1,133 @@
+# Incremental breakout detectors for streaming candles.
+# is_breakout_band() rescans its whole window on every call; these keep the
+# prior-window max high in a monotonic deque and the prior-window volume in a
+# running sum, so each new or updated candle costs O(1) amortized. Intrabar
+# updates (same candle time, new values) only replace the last candle.
+from collections import deque
+from math import fsum
+
+# Re-sum the volume window from scratch after this many evictions to cancel float drift
+_RESYNC_EVERY = 4096
+
+
+class BandDetector:
+    """
+    Streaming equivalent of is_breakout_band() for one (symbol, band).
+    The band covers the newest `window` candles: the last (possibly still forming)
+    candle plus up to window - 1 prior closed candles.
+    """
+
+    def __init__(self, window, breakout_threshold, volume_spike_ratio):
+        self.window = window
+        self.breakout_threshold = breakout_threshold
+        self.volume_spike_ratio = volume_spike_ratio
+        self._prior = deque()   # (time, high, volume) of prior candles, oldest first
+        self._maxq = deque()    # (time, high), highs strictly decreasing from the left
+        self._vol_sum = 0.0
+        self._evictions = 0
+        self._last = None       # (time, high, close, volume) of the newest candle
+
+    def _push_prior(self, t, high, vol):
+        self._prior.append((t, high, vol))
+        self._vol_sum += vol
+        while self._maxq and self._maxq[-1][1] <= high:
+            self._maxq.pop()
+        self._maxq.append((t, high))
+
+        if len(self._prior) > self.window - 1:
+            old_t, _, old_vol = self._prior.popleft()
+            self._vol_sum -= old_vol
+            if self._maxq[0][0] == old_t:
+                self._maxq.popleft()
+            self._evictions += 1
+            if self._evictions >= _RESYNC_EVERY:
+                self._vol_sum = fsum(v for _, _, v in self._prior)
+                self._evictions = 0
+
+    def update(self, candle, abs_dollar_volume_min):
+        """
+        Feed the newest candle ([time, low, high, open, close, volume]).
+        A newer time rolls the previous last candle into the prior window; the
+        same time replaces it (intrabar). Returns (hit, info) like is_breakout_band.
+        """
+        t, high, close, vol = candle[0], candle[2], candle[4], candle[5]
+        if self._last is not None:
+            if t < self._last[0]:
+                return self.evaluate(abs_dollar_volume_min)
+            if t > self._last[0]:
+                self._push_prior(self._last[0], self._last[1], self._last[3])
+        self._last = (t, high, close, vol)
+        return self.evaluate(abs_dollar_volume_min)
+
+    def evaluate(self, abs_dollar_volume_min):
+        n_prior = len(self._prior)
+        # Like detection.assess_bands: no verdict until the window is full
+        if self._last is None or n_prior + 1 < max(self.window, 3):
+            return False, None
+
+        max_high    = self._maxq[0][1]
+        last_close  = self._last[2]
+        avg_vol     = self._vol_sum / n_prior
+        last_vol    = self._last[3]
+        usd_per_min = last_vol * last_close
+
+        pct_over    = ((last_close / max_high) - 1.0) * 100 if max_high > 0 else 0.0
+        vol_ratio   = (last_vol / avg_vol) if avg_vol > 0 else 0.0
+
+        hit = (
+            last_close > max_high * (1 + self.breakout_threshold) and
+            last_vol   > avg_vol   * self.volume_spike_ratio and
+            usd_per_min >= abs_dollar_volume_min
+        )
+
+        info = {
+            "window": n_prior + 1,
+            "last_close": float(last_close),
+            "max_high": float(max_high),
+            "pct_over": float(pct_over),
+            "last_vol": float(last_vol),
+            "avg_vol": float(avg_vol),
+            "vol_ratio": float(vol_ratio),
+            "usd_per_min": float(usd_per_min),
+        }
+        return hit, info
+
+
+class DetectorBank:
+    """
+    One BandDetector per (symbol, band), created on first sight of a symbol.
+    bands: iterable of bands.Band. Only bands on the stream's own candles
+    (`granularity`) get detectors; the others are listed in `coarse`.
+    """
+
+    def __init__(self, bands, granularity=None):
+        bands = list(bands)
+        self.all_bands = bands
+        self.bands = [b for b in bands if b.granularity in (None, granularity)]
+        self.coarse = [b for b in bands if b.granularity not in (None, granularity)]
+        self._detectors = {}
+
+    def _for_symbol(self, symbol):
+        dets = self._detectors.get(symbol)
+        if dets is None:
+            dets = self._detectors[symbol] = [
+                (band, BandDetector(band.window, band.threshold, band.ratio))
+                for band in self.bands
+            ]
+        return dets
+
+    def __contains__(self, symbol):
+        return symbol in self._detectors
+
+    def seed(self, symbol, candles, abs_dollar_volume_min):
+        """Replay historical candles (oldest first) into a symbol's detectors."""
+        self._detectors.pop(symbol, None)
+        for candle in candles:
+            self.update(symbol, candle, abs_dollar_volume_min)
+
+    def update(self, symbol, candle, abs_dollar_volume_min):
+        """Feed a symbol's newest candle to all its bands; returns [(name, hit, info), ...]."""
+        return [
+            (band.name, *det.update(candle, band.floor(abs_dollar_volume_min)))
+            for band, det in self._for_symbol(symbol)
+        ]
@@ -0,0 +1,200 @@
+# The set of pairs the scanner watches, and how often each one is swept.
+# UNIVERSE_SOURCE picks the candidates:
+#   coins     settings.COINS + settings.USDC_ONLY_COINS (the default)
+#   file      the JSON list of pair ids in UNIVERSE_FILE (as written by
+#             top50coinsfetcher.py), re-read whenever the file changes
+#   products  every online USD pair listed by the exchange's /products
+# Stablecoin pairs are always dropped, and pairs the exchange no longer lists as
+# online are dropped too (the listing is re-checked every UNIVERSE_REFRESH_SEC).
+#
+# REST sweeps are then tiered by recent activity: hot pairs (high $/min or a wide
+# band, or a recent alert) are fetched every sweep, warm ones every
+# TIER_WARM_EVERY sweeps and cold ones (below the dollar-volume floor and flat)
+# every TIER_COLD_EVERY sweeps, staggered so each sweep takes an even slice.
+# Pairs with no history yet count as hot until their first scan.
+import json
+import os
+import threading
+import time
+
+from . import settings
+from .events import BREAKOUT_ALERT, SCAN_RESULT
+from .sharding import key_hash
+
+UNIVERSE_TIERS = os.getenv("UNIVERSE_TIERS", "1") == "1"                   # 0 = sweep every pair every cycle
+TIER_HOT_USD = float(os.getenv("TIER_HOT_USD", "20000"))                  # $/min that makes a pair hot
+TIER_HOT_BAND_WIDTH = float(os.getenv("TIER_HOT_BAND_WIDTH", "1.0"))      # band width % that makes a pair hot
+TIER_COLD_BAND_WIDTH = float(os.getenv("TIER_COLD_BAND_WIDTH", "0.3"))    # cold: under the $/min floor and this flat
+TIER_WARM_EVERY = int(os.getenv("TIER_WARM_EVERY", "3"))                  # sweep warm pairs every Nth cycle
+TIER_COLD_EVERY = int(os.getenv("TIER_COLD_EVERY", "10"))                 # sweep cold pairs every Nth cycle
+TIER_ALERT_HOLD_SEC = 900                                                 # a pair stays hot this long after an alert
+ACTIVITY_ALPHA = 0.3                                                      # EWMA weight of the newest scan
+
+STABLE_BASES = {"USDC", "USDT", "DAI", "PYUSD", "GUSD", "EURC", "PAX", "BUSD", "TUSD", "FDUSD", "USDS", "UST"}
+
+HOT = "hot"
+WARM = "warm"
+COLD = "cold"
+
+
+class WatchedPairList:
+    """A JSON list of pair ids on disk, re-read when its modification time changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._stamp = None
+        self._pairs = []
+        self._lock = threading.Lock()
+
+    def pairs(self):
+        """The current list; the previous one is kept if the file is missing or invalid."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return self._pairs
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._stamp = stamp
+                    try:
+                        with open(self.path, encoding="utf-8") as f:
+                            pairs = json.load(f)
+                        if not isinstance(pairs, list) or not all(isinstance(p, str) for p in pairs):
+                            raise ValueError("expected a JSON list of pair ids")
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️ Ignoring universe file {self.path}: {e}", flush=True)
+                    else:
+                        if pairs != self._pairs:
+                            print(f"🔄 Universe reloaded: {len(pairs)} pairs from {self.path}", flush=True)
+                        self._pairs = pairs
+        return self._pairs
+
+
+def write_pairs(path, pairs):
+    """Atomically replace `path` with a JSON list of pair ids."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(list(pairs), f)
+    os.replace(tmp, path)
+
+
+def is_stable(pair):
+    return pair.split("-")[0] in STABLE_BASES
+
+
+class UniverseManager:
+    def __init__(self, refresh_sec=None):
+        self.refresh_sec = refresh_sec
+        self._watched = None
+        self._listing = None         # pair id -> tradable, from /products
+        self._listing_at = None
+        self._activity = {}          # pair -> (EWMA $/min, EWMA band width %)
+        self._hot_until = {}         # pair -> wall time its alert promotion ends
+        self._offsets = {}
+        self._attached = False
+        self._lock = threading.Lock()
+
+    # --- candidates --- #
+
+    def _refresh_listing(self):
+        """Re-read /products if the listing is older than UNIVERSE_REFRESH_SEC."""
+        refresh = settings.UNIVERSE_REFRESH_SEC if self.refresh_sec is None else self.refresh_sec
+        now = time.monotonic()
+        if self._listing_at is not None and now - self._listing_at < refresh:
+            return
+        self._listing_at = now        # also after a failure: retry next period, not every sweep
+        from .http_session import get_session
+        try:
+            r = get_session().get(f"{settings.BASE_URL}/products", timeout=20)
+            r.raise_for_status()
+            self._listing = {
+                p["id"]: p.get("status") == "online" and not p.get("trading_disabled", False)
+                for p in r.json()
+            }
+        except Exception as e:
+            print(f"⚠️ Could not refresh the product listing: {e}", flush=True)
+
+    def candidates(self):
+        source = settings.UNIVERSE_SOURCE
+        if source == "file":
+            if self._watched is None or self._watched.path != settings.UNIVERSE_FILE:
+                self._watched = WatchedPairList(settings.UNIVERSE_FILE)
+            pairs = self._watched.pairs()
+            if pairs:
+                return pairs
+        elif source == "products" and self._listing:
+            return sorted(p for p, ok in self._listing.items() if ok and p.endswith("-USD"))
+        return settings.COINS + settings.USDC_ONLY_COINS
+
+    def pairs(self):
+        """Every pair currently in the universe: candidates minus stablecoins and delisted pairs."""
+        if settings.UNIVERSE_SOURCE == "products" or settings.UNIVERSE_CHECK_LISTING:
+            self._refresh_listing()
+        listing = self._listing
+        return [p for p in self.candidates() if not is_stable(p) and (not listing or listing.get(p, False))]
+
+    # --- tiers --- #
+
+    def attach(self, bus):
+        """Learn pair activity from the engine's scan results and alerts (idempotent)."""
+        if not self._attached:
+            self._attached = True
+            bus.subscribe(SCAN_RESULT, self.observe)
+            bus.subscribe(BREAKOUT_ALERT, self.on_alert)
+
+    def observe(self, data):
+        usd, width = data.get("usd_per_min"), data.get("band_width")
+        if usd is None or width is None:
+            return
+        with self._lock:
+            prev = self._activity.get(data["symbol"])
+            if prev is not None:
+                usd = prev[0] + ACTIVITY_ALPHA * (usd - prev[0])
+                width = prev[1] + ACTIVITY_ALPHA * (width - prev[1])
+            self._activity[data["symbol"]] = (usd, width)
+
+    def on_alert(self, data):
+        self._hot_until[data["symbol"]] = time.time() + TIER_ALERT_HOLD_SEC
+
+    def tier(self, pair, now=None):
+        if self._hot_until.get(pair, 0) > (time.time() if now is None else now):
+            return HOT
+        activity = self._activity.get(pair)
+        if activity is None:
+            return HOT
+        usd, width = activity
+        if usd >= TIER_HOT_USD or width >= TIER_HOT_BAND_WIDTH:
+            return HOT
+        if usd < settings.ABSOLUTE_DOLLAR_VOLUME_MIN and width < TIER_COLD_BAND_WIDTH:
+            return COLD
+        return WARM
+
+    def select(self, pairs, sweep):
+        """The subset of `pairs` due in sweep number `sweep`."""
+        if not UNIVERSE_TIERS:
+            return pairs
+        every = {HOT: 1, WARM: TIER_WARM_EVERY, COLD: TIER_COLD_EVERY}
+        now = time.time()
+        due = []
+        for pair in pairs:
+            offset = self._offsets.get(pair)
+            if offset is None:
+                offset = self._offsets[pair] = key_hash(pair)
+            if (sweep + offset) % every[self.tier(pair, now)] == 0:
+                due.append(pair)
+        return due
+
+    def tier_counts(self, pairs):
+        counts = {HOT: 0, WARM: 0, COLD: 0}
+        now = time.time()
+        for pair in pairs:
+            counts[self.tier(pair, now)] += 1
+        return counts
+
+
+universe = UniverseManager()
+
+def all_pairs():
+    """The pairs to scan right now."""
+    return universe.pairs()
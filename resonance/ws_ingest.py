@@ -0,0 +1,241 @@
+# Streaming ingestion from the exchange's public WebSocket feed.
+# Trades from the `matches` (or `ticker`) channel are folded into 1m candles
+# locally, in the same [time, low, high, open, close, volume] layout that
+# get_candles() returns, so is_breakout_band() can run the instant a candle
+# closes (or intrabar) without polling REST for every symbol.
+#
+# Point WS_FEED_URL at ws_replay_server.py to run against recorded messages.
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from websockets.sync.client import connect
+
+from .candle_store import CandleRing, EMPTY_WINDOW
+
+WS_FEED_URL = os.getenv("WS_FEED_URL", "wss://ws-feed.exchange.coinbase.com")
+
+
+def parse_time(value):
+    """Exchange ISO-8601 timestamp ('2024-01-01T00:00:00.123456Z') -> epoch seconds."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class CandleAggregator:
+    """
+    Builds OHLCV candles per product from individual trades, stored in
+    array-backed ring buffers of the most recent `maxlen` candles. Minutes
+    without trades produce no candle, matching the REST /candles endpoint.
+    """
+
+    def __init__(self, granularity=60, maxlen=20):
+        self.granularity = granularity
+        self.maxlen = maxlen
+        self._rings = {}
+        self._open = {}   # product_id -> bucket time of its still-forming candle
+        self._lock = threading.Lock()
+
+    def seed(self, product_id, candles):
+        """Prime a product with candles fetched over REST (treated as closed)."""
+        ring = CandleRing(self.maxlen)
+        for c in sorted(candles, key=lambda c: c[0]):
+            ring.append(c)
+        with self._lock:
+            self._rings[product_id] = ring
+            self._open.pop(product_id, None)
+
+    def resize(self, maxlen):
+        """Grow every ring to hold `maxlen` candles, keeping what is held. Never shrinks."""
+        if maxlen <= self.maxlen:
+            return
+        with self._lock:
+            self.maxlen = maxlen
+            for product_id, ring in list(self._rings.items()):
+                bigger = CandleRing(maxlen)
+                for row in ring.window():
+                    bigger.append(row)
+                self._rings[product_id] = bigger
+
+    def add_trade(self, product_id, price, size, ts):
+        """
+        Fold one trade into its candle.
+        Returns True when the trade opened a new bucket while the previous candle
+        was still open, i.e. that candle has just closed.
+        """
+        bucket = float(int(ts // self.granularity) * self.granularity)
+        with self._lock:
+            ring = self._rings.get(product_id)
+            if ring is None:
+                ring = self._rings[product_id] = CandleRing(self.maxlen)
+            last = ring.last()
+
+            if last is not None and bucket < last[0]:
+                # Late trade for an older candle: patch it in place if we still hold it
+                old = ring.find(bucket)
+                if old is not None:
+                    t, low, high, open_, close, vol = old
+                    ring.upsert((t, min(low, price), max(high, price), open_, close, vol + size))
+                return False
+
+            if last is not None and bucket == last[0]:
+                t, low, high, open_, close, vol = last
+                ring.upsert((t, min(low, price), max(high, price), open_, price, vol + size))
+                self._open[product_id] = bucket
+                return False
+
+            closed = product_id in self._open
+            ring.append((bucket, price, price, price, price, size))
+            self._open[product_id] = bucket
+            return closed
+
+    def close_due(self, now):
+        """Close every open candle whose minute has ended; returns the product ids closed."""
+        cutoff = now - self.granularity
+        with self._lock:
+            due = [pid for pid, bucket in self._open.items() if bucket <= cutoff]
+            for pid in due:
+                del self._open[pid]
+        return due
+
+    def candles(self, product_id, include_open=True):
+        """
+        Zero-copy CandleWindow, oldest first; with include_open=False the
+        still-forming candle is left out.
+        """
+        with self._lock:
+            ring = self._rings.get(product_id)
+            if ring is None:
+                return EMPTY_WINDOW
+            window = ring.window()
+            if not include_open and product_id in self._open:
+                window = window[:-1]
+        return window
+
+
+class StreamIngestor:
+    """
+    Subscribes to the WebSocket feed for `product_ids` and calls
+    on_close(product_id, candles) whenever a candle closes. If on_intrabar is
+    given it is also called with the forming candle included, at most once per
+    `intrabar_interval` seconds per product.
+    """
+
+    def __init__(
+        self,
+        product_ids,
+        on_close,
+        on_intrabar=None,
+        url=WS_FEED_URL,
+        channel="matches",
+        granularity=60,
+        maxlen=20,
+        intrabar_interval=1.0,
+        record_path=None,
+    ):
+        self.product_ids = list(product_ids)
+        self.on_close = on_close
+        self.on_intrabar = on_intrabar
+        self.url = url
+        self.channel = channel
+        self.intrabar_interval = intrabar_interval
+        self.record_path = record_path
+        self.aggregator = CandleAggregator(granularity=granularity, maxlen=maxlen)
+        self._last_intrabar = {}
+        # Feed clock: newest trade time seen, advanced by wall time since it arrived.
+        # Keeps candle closing correct when a replay runs faster than real time.
+        self._feed_time = None
+        self._feed_mono = 0.0
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        """Stream until stop() is called, reconnecting with backoff on errors."""
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                self._run_once()
+                backoff = 1.0
+            except Exception as e:
+                print(f"❌ WebSocket feed error: {e} (reconnecting in {backoff:.0f}s)", flush=True)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    def _subscribe(self, ws):
+        ws.send(json.dumps({
+            "type": "subscribe",
+            "product_ids": self.product_ids,
+            "channels": [self.channel],
+        }))
+
+    def _run_once(self):
+        record = open(self.record_path, "a", encoding="utf-8") if self.record_path else None
+        try:
+            with connect(self.url, open_timeout=10, max_size=None) as ws:
+                self._subscribe(ws)
+                print(f"📡 Subscribed to {self.channel} for {len(self.product_ids)} products at {self.url}", flush=True)
+                while not self._stop.is_set():
+                    try:
+                        raw = ws.recv(timeout=1.0)
+                    except TimeoutError:
+                        raw = None
+                    if raw:
+                        if record:
+                            record.write(raw.rstrip("\n") + "\n")
+                        msg = json.loads(raw)
+                        if msg.get("type") == "error":
+                            self._handle_error(ws, msg)
+                        else:
+                            self.handle_message(msg)
+                    self.flush(self.feed_now())
+        finally:
+            if record:
+                record.close()
+
+    def _handle_error(self, ws, msg):
+        reason = msg.get("reason", "") or ""
+        print(f"⚠️ WebSocket feed error message: {msg.get('message')} {reason}", flush=True)
+        # One delisted product rejects the whole subscription; drop it and resubscribe the rest
+        bad = [pid for pid in self.product_ids if reason.startswith(f"{pid} ")]
+        if bad:
+            self.product_ids = [pid for pid in self.product_ids if pid not in bad]
+            print(f"⚠️ Dropping invalid products from stream: {bad}", flush=True)
+            self._subscribe(ws)
+
+    def handle_message(self, msg):
+        """Apply one decoded feed message. Usable directly when replaying recordings."""
+        mtype = msg.get("type")
+        if mtype == "match":
+            size = float(msg["size"])
+        elif mtype == "ticker" and "last_size" in msg:
+            size = float(msg["last_size"])
+        else:
+            # 'last_match' replays a trade that the REST seed already counted
+            return
+
+        product_id = msg["product_id"]
+        ts = parse_time(msg["time"]) if msg.get("time") else time.time()
+        if self._feed_time is None or ts >= self._feed_time:
+            self._feed_time, self._feed_mono = ts, time.monotonic()
+        closed = self.aggregator.add_trade(product_id, float(msg["price"]), size, ts)
+
+        if closed:
+            self.on_close(product_id, self.aggregator.candles(product_id, include_open=False))
+        if self.on_intrabar is not None:
+            now = time.monotonic()
+            if now - self._last_intrabar.get(product_id, 0.0) >= self.intrabar_interval:
+                self._last_intrabar[product_id] = now
+                self.on_intrabar(product_id, self.aggregator.candles(product_id))
+
+    def feed_now(self):
+        if self._feed_time is None:
+            return time.time()
+        return self._feed_time + (time.monotonic() - self._feed_mono)
+
+    def flush(self, now):
+        """Close candles for products that have gone quiet past the end of their minute."""
+        for product_id in self.aggregator.close_due(now):
+            self.on_close(product_id, self.aggregator.candles(product_id))
@@ -1,6 +1,9 @@
-import time, math, json, statistics
+import argparse, heapq, math, statistics, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-import requests
+
+from resonance.http_session import build_session
+from resonance.universe import write_pairs
 
 TOP_N = 50
 GRANULARITY_SEC = 60
@@ -9,12 +12,13 @@ MIN_USD_PER_MIN = 2000.0
 MAX_SPREAD_PCT = .5/100
 MIN_PRICE_USD = 0.0001
 EXCLUDE_BASES = {"USDC","DAI","USDT","PYUSD"}
-OUTPUT_PATH = "top50_usd_pairs.txt"
+OUTPUT_PATH = "top50_usd_pairs.txt"   # point the scanner's UNIVERSE_FILE here to hot-reload it
+WORKERS = 8                           # products evaluated concurrently (requests are still rate limited)
 
 EXCHANGE_API = "https://api.exchange.coinbase.com"
 
-session = requests.Session()
-session.headers.update({"User-Agent": "usd-curator/1.0"})
+# Requests are paced by the shared token-bucket limiter instead of fixed sleeps
+session = build_session(user_agent="usd-curator/1.0")
 
 def get_products_usd():
     r = session.get(f"{EXCHANGE_API}/products", timeout=20)
@@ -75,49 +79,87 @@ def score_coin(m):
     liq_bonus = min(1.0, (m["avg_usd_per_min"] / (MIN_USD_PER_MIN*3.0)))
     return vol_score + liq_bonus
 
-def main():
+def evaluate_product(pid):
+    """
+    Returns (reason, info): reason is None if the product qualifies. The book is
+    checked first, so products with a wide spread never cost a candle request.
+    """
+    spread = get_l1_spread_pct(pid)
+    if spread is None or spread > MAX_SPREAD_PCT:
+        return f"spread {spread*100 if spread else 0:.3f}%", None
+
+    candles = get_recent_candles(pid, GRANULARITY_SEC, LOOKBACK_MIN)
+    if not candles:
+        return "no candles", None
+
+    m = candle_metrics_usd(candles)
+    if not m:
+        return "metrics fail", None
+
+    if m["last_close"] < MIN_PRICE_USD:
+        return f"price {m['last_close']:.6f} < min", None
+    if m["avg_usd_per_min"] < MIN_USD_PER_MIN:
+        return f"$/min {m['avg_usd_per_min']:.0f} < {MIN_USD_PER_MIN}", None
+
+    m["spread"] = spread
+    m["score"] = score_coin(m)
+    return None, m
+
+def curate(products, workers=WORKERS, top_n=TOP_N):
+    """
+    Evaluate products on a bounded thread pool, scoring each as it completes and
+    keeping only the best top_n in a heap. Returns their ids, best first.
+    """
+    top = []    # min-heap of (score, product_id)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="curate") as pool:
+        futures = {pool.submit(evaluate_product, pid): pid for pid in products}
+        for i, fut in enumerate(as_completed(futures), 1):
+            pid = futures[fut]
+            try:
+                reason, m = fut.result()
+            except Exception as e:
+                reason, m = f"error {e}", None
+            if m is None:
+                print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped ({reason})")
+                continue
+            s = m["score"]
+            if len(top) < top_n:
+                heapq.heappush(top, (s, pid))
+            elif s > top[0][0]:
+                heapq.heapreplace(top, (s, pid))
+            print(f"[{i}/{len(products)}] {pid:<12} ✅ kept | price={m['last_close']:.6f} $/min={m['avg_usd_per_min']:.0f} spread={m['spread']*100:.3f}% score={s:.2f}")
+    return [pid for _, pid in sorted(top, reverse=True)]
+
+def refresh(output_path=OUTPUT_PATH, workers=WORKERS):
+    started = time.monotonic()
     products = get_products_usd()
     print(f"Found {len(products)} USD pairs. Scanning...\n")
 
-    rows = []
-    for i, pid in enumerate(products, 1):
-        spread = get_l1_spread_pct(pid)
-        if spread is None or spread > MAX_SPREAD_PCT:
-            print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped (spread {spread*100 if spread else 0:.3f}%)")
-            continue
-
-        candles = get_recent_candles(pid, GRANULARITY_SEC, LOOKBACK_MIN)
-        if not candles:
-            print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped (no candles)")
-            continue
-
-        m = candle_metrics_usd(candles)
-        if not m:
-            print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped (metrics fail)")
-            continue
-
-        if m["last_close"] < MIN_PRICE_USD:
-            print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped (price {m['last_close']:.6f} < min)")
-            continue
-        if m["avg_usd_per_min"] < MIN_USD_PER_MIN:
-            print(f"[{i}/{len(products)}] {pid:<12} ❌ skipped ($/min {m['avg_usd_per_min']:.0f} < {MIN_USD_PER_MIN})")
-            continue
+    top_ids = curate(products, workers)
+    # Replaced atomically: a scanner watching this file never reads a partial list
+    write_pairs(output_path, top_ids)
 
-        s = score_coin(m)
-        rows.append({"product_id": pid, "score": s})
-        print(f"[{i}/{len(products)}] {pid:<12} ✅ kept | price={m['last_close']:.6f} $/min={m['avg_usd_per_min']:.0f} spread={spread*100:.3f}% score={s:.2f}")
-
-        if i % 10 == 0:
-            time.sleep(0.5)
-
-    rows.sort(key=lambda x: x["score"], reverse=True)
-    top_ids = [r["product_id"] for r in rows[:TOP_N]]
-
-    with open(OUTPUT_PATH, "w") as f:
-        f.write(json.dumps(top_ids))
-
-    print(f"\nSaved {len(top_ids)} pairs to {OUTPUT_PATH}")
+    print(f"\nSaved {len(top_ids)} pairs to {output_path} in {time.monotonic() - started:.1f}s")
     print("Top 10 preview:", top_ids[:10])
 
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Curate the most active USD pairs for the scanner")
+    ap.add_argument("--output", default=OUTPUT_PATH, help=f"Output file (default: {OUTPUT_PATH})")
+    ap.add_argument("--workers", type=int, default=WORKERS, help=f"Products evaluated concurrently (default: {WORKERS})")
+    ap.add_argument("--every", type=float, default=0, metavar="MINUTES",
+                    help="Keep running and refresh the list every MINUTES (default: once)")
+    args = ap.parse_args(argv)
+
+    while True:
+        try:
+            refresh(args.output, args.workers)
+        except Exception as e:
+            if not args.every:
+                raise
+            print(f"❌ Curation failed: {e}")
+        if not args.every:
+            return
+        time.sleep(args.every * 60)
+
 if __name__ == "__main__":
     main()
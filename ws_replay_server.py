@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Local stand-in for the exchange WebSocket feed.
+# Plays back recorded feed messages (one JSON object per line, e.g. captured with
+# STREAM_RECORD=feed.jsonl) to any client that subscribes, so the streaming
+# ingestion mode can be exercised offline:
+#
+#   python ws_replay_server.py feed.jsonl --port 8765 --speed 10
+#   WS_FEED_URL=ws://localhost:8765 python -m resonance --mode stream
+import argparse
+import json
+import time
+
+from websockets.sync.server import serve
+
+from resonance.ws_ingest import parse_time
+
+
+def load_messages(path):
+    messages = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                messages.append(json.loads(line))
+    return messages
+
+
+def make_handler(messages, speed, loop):
+    def handler(ws):
+        sub = json.loads(ws.recv())
+        products = set(sub.get("product_ids") or [])
+        channels = sub.get("channels") or []
+        ws.send(json.dumps({"type": "subscriptions", "channels": [
+            {"name": ch if isinstance(ch, str) else ch.get("name"), "product_ids": sorted(products)}
+            for ch in channels
+        ]}))
+        print(f"▶️  Replaying {len(messages)} messages for {len(products)} products (speed x{speed or 'max'})", flush=True)
+
+        while True:
+            prev_ts = None
+            for msg in messages:
+                if msg.get("type") in ("subscriptions", "error"):
+                    continue
+                if products and msg.get("product_id") not in products:
+                    continue
+                # Keep the recorded spacing between messages, compressed by `speed` (0 = no delay)
+                ts = parse_time(msg["time"]) if msg.get("time") else None
+                if speed and ts is not None and prev_ts is not None and ts > prev_ts:
+                    time.sleep((ts - prev_ts) / speed)
+                if ts is not None:
+                    prev_ts = ts
+                ws.send(json.dumps(msg))
+            if not loop:
+                break
+        print("⏹️  Replay finished", flush=True)
+        # Hold the connection open so the client sees a quiet feed rather than a reconnect
+        for _ in ws:
+            pass
+    return handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Replay recorded exchange feed messages over a local WebSocket")
+    ap.add_argument("recording", help="JSONL file with one feed message per line")
+    ap.add_argument("--host", default="localhost")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier (0 = as fast as possible)")
+    ap.add_argument("--loop", action="store_true", help="Start over when the recording ends")
+    args = ap.parse_args()
+
+    messages = load_messages(args.recording)
+    with serve(make_handler(messages, args.speed, args.loop), args.host, args.port) as server:
+        print(f"🎞️  Replay server listening on ws://{args.host}:{args.port}", flush=True)
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()